@@ -1,98 +1,262 @@
 #TitanWar_Combo_Helper.py:
 
-from tkinter import Tk, Label, Button, Frame, Canvas, Scrollbar
-from character_utils import calculate_best_combination, activate_cards
-from utils import load_data, save_config, load_config, load_image, save_team, load_team, get_localized_image_name
-from image_utils import combine_images, add_overlay, remove_overlay
-from gui_layout import setup_gui_layout
-from update import download_and_extract_zip
+from tkinter import messagebox, Tk, PhotoImage
+from character_utils import (
+    calculate_best_combination, calculate_best_teams, activate_cards, CardActivationIndex, default_worker_count
+)
+from utils import (
+    load_data, load_image, get_localized_image_name, ConfigStore, CANONICAL_LANGUAGE
+)
+from data_model import get_data_model
+from image_utils import BackgroundImageLoader
+from character_grid import CharacterGrid
+from selection_view import SelectionView
+from image_cache import image_cache
+from result_cache import result_cache
+from team_library import TeamLibrary
+from gui_layout import setup_gui_layout, setup_filter_options
+from update import download_file, AssetUpdater, IMG_ZIP_URL, MANIFEST_URL
+from asset_provider import assets, IMG_ZIP_FILE
 from calc_feedback import CalculationFeedback
 import os
-import subprocess
+import sys
 import time
+import threading
+import multiprocessing
 
 def check_and_update_img():
     """
-    Überprüft, ob das Verzeichnis 'img' und die Datei 'data.json' existieren.
-    Falls nicht, wird die ZIP-Datei heruntergeladen und entpackt.
+    Übernimmt ein im letzten Lauf vorbereitetes Update und überprüft, ob die
+    Bilder (Verzeichnis 'img' oder 'img.zip') und die Datei 'data.json'
+    vorhanden sind. Fehlende Dateien werden über das Manifest geladen; fehlen
+    danach noch die Bilder, wird img.zip heruntergeladen und ohne Entpacken
+    verwendet.
     """
-    img_url = "https://github.com/blobb999/TitanWar-Combo-Helper/raw/main/img.zip"
-    if not os.path.exists("./img") or not os.path.exists("data.json"):
+    updater = AssetUpdater("./")
+    try:
+        updater.apply()
+    except OSError as e:
+        print(f"Vorbereitetes Update konnte nicht übernommen werden: {e}")
+
+    if not assets.open_source() or not os.path.exists("data.json"):
+        if os.environ.get(NO_UPDATE_ENV):
+            print("Notwendige Dateien fehlen; Downloads sind abgeschaltet.")
+            return
         print("Notwendige Dateien fehlen. Update wird durchgeführt...")
-        download_and_extract_zip(img_url, "./")
+        try:
+            # Bilder werden direkt aus img.zip gelesen, lose Dateien sind nicht nötig
+            updater.update(MANIFEST_URL, exclude=("img/",))
+        except Exception as e:
+            print(f"Update über das Manifest fehlgeschlagen: {e}")
+        if not assets.open_source():
+            print(f"Lade {IMG_ZIP_URL} herunter...")
+            try:
+                download_file(IMG_ZIP_URL, IMG_ZIP_FILE)
+            except Exception as e:
+                print(f"Fehler beim Herunterladen: {e}")
+            assets.open_source()
     else:
         print("Alle erforderlichen Dateien sind vorhanden.")
 
+def stage_asset_update():
+    """
+    Lädt geänderte Bilder und Kartendaten im Hintergrund herunter.
+    Übernommen werden sie beim nächsten Start in check_and_update_img.
+    """
+    # Im Archivmodus keine losen Bilder laden; entpackte Bilder erneuert apply aus einem neuen img.zip
+    exclude = ("img/",) if assets.archive is not None else ()
+    try:
+        staged = AssetUpdater("./").stage(MANIFEST_URL, exclude)
+    except Exception as e:
+        print(f"Update-Prüfung fehlgeschlagen: {e}")
+        return
+    if staged:
+        print(f"{staged} aktualisierte Dateien bereit; sie werden beim nächsten Start übernommen.")
+
 # Konfigurations- und Datenpfade
 CONFIG_FILE = "config.cfg"
 BUFFS_DIR = "./img/Buffs"
 DATA_FILE = "data.json"
 
-# Daten laden
-data = load_data(DATA_FILE)
+# Anzahl der Prozesse für die Autofill-Suche
+SOLVER_WORKERS = default_worker_count()
+
+# Speicherobergrenze für zwischengespeicherte Bilder in Bytes
+IMAGE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+# Zeitbudget der Autofill-Suche in Sekunden; danach wird das beste bisherige Team verwendet
+SOLVER_TIME_BUDGET = 30
+
+# Abfrageintervall, solange die Dateiprüfung im Hintergrund läuft (ms)
+ASSET_CHECK_POLL_MS = 50
+
+# Umgebungsvariable für startup_benchmark.py: meldet Startzeitpunkte und beendet das Programm
+STARTUP_PROBE_ENV = "TWCH_STARTUP_PROBE"
+
+# Umgebungsvariable, die alle Downloads abschaltet (z. B. für Startzeitmessungen ohne Netzwerk)
+NO_UPDATE_ENV = "TWCH_NO_UPDATE"
+
+# Kartendaten; werden erst geladen, nachdem das Fenster steht (load_card_data)
+data = None
+data_model = None
+translations = None
+
+
+def load_card_data():
+    """
+    Lädt data.json samt kompiliertem Datenmodell und bindet den Ergebnis-Cache daran.
+    """
+    global data, data_model, translations
+    data = load_data(DATA_FILE)
+    data_model = get_data_model(data)
+    translations = data_model.translations
+
+    # Autofill-Ergebnisse gelten nur für genau diese Kartendaten
+    result_cache.bind(data, translations)
 
 class CardSelectorApp:
     def __init__(self, root):
         self.root = root
         self.root.title("TitanWar Combo Helper")
+        image_cache.set_limit(IMAGE_CACHE_MAX_BYTES)
 
-        # Sprache Laden
-        self.language, self.excluded_characters, self.teams = load_config(CONFIG_FILE)
+        # Sprache Laden; Änderungen werden gesammelt und verzögert geschrieben
+        self.config_store = ConfigStore(CONFIG_FILE)
+        self.language = self.config_store.language
+        self.excluded_characters = set(self.config_store.excluded)
 
-        # Initialisierungen
+        # Teams liegen in der Teambibliothek; die sechs Team-Buttons zeigen deren Einträge "Team 1" bis "Team 6".
+        # self.teams hält diese sechs Teams in der aktuellen Sprache, gefüllt in finish_startup
+        self.team_library = TeamLibrary()
+        self.teams = {}
+
+        # Initialisierungen; Daten, Index und Raster folgen in finish_startup
         self.selected_characters = []
         self.activated_cards = set()
+        self.activation_index = None
+        self.data_model = None
+        self.character_grid = None
 
         self.img_dir = "./img/chars"
         self.overlay_path = os.path.join(self.img_dir, "deactivated.png")
-        self.overlay_image = (
-            load_image(self.overlay_path, (80, 80)) if os.path.exists(self.overlay_path) else None
-        )
+
+        # Porträts werden im Hintergrund dekodiert; bis dahin zeigt jede Zelle einen Platzhalter
+        self.image_loader = BackgroundImageLoader(self.root)
+        self.placeholder_image = PhotoImage(width=80, height=80)
 
         # GUI-Aufbau über ausgelagertes Layout
         setup_gui_layout(self)
 
+        # Auswahl, Kartenbuffs und Vorschläge als wiederverwendete Widgets
+        self.selection_view = SelectionView(
+            self.selected_characters_frame, self.activated_cards_frame, self.suggestions_frame,
+            self.img_dir, BUFFS_DIR, self.select_character,
+        )
+        self.redraw_pending = False
+
+        # Bilder und data.json im Hintergrund prüfen (ggf. herunterladen); das Fenster ist sofort da
+        self.info_label.config(text="Loading..." if self.language == "EN" else "Lade Daten...")
+        self.asset_check = threading.Thread(target=check_and_update_img, daemon=True)
+        self.asset_check.start()
+        self.root.after(ASSET_CHECK_POLL_MS, self.wait_for_assets)
+
+        # Beim Schließen ausstehende Konfigurationsänderungen schreiben
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def wait_for_assets(self):
+        """
+        Wartet ohne Blockieren auf die Dateiprüfung und schließt dann den Start ab.
+        """
+        if self.asset_check.is_alive():
+            self.root.after(ASSET_CHECK_POLL_MS, self.wait_for_assets)
+            return
+        self.finish_startup()
+
+    def finish_startup(self):
+        """
+        Lädt Daten, Index und Charakterraster, sobald die Dateien vorhanden sind.
+        """
+        try:
+            load_card_data()
+        except (OSError, ValueError) as e:
+            self.show_startup_error(e)
+            return
+        self.data_model = data_model
+        self.activation_index = CardActivationIndex(data, self.language)
+        setup_filter_options(self)
+        self.load_team_slots()
+
+        self.overlay_image = (
+            load_image(self.overlay_path, (80, 80)) if assets.exists(self.overlay_path) else None
+        )
+
+        # Charakterraster direkt auf dem Canvas; die Bilddateien tragen kanonische Namen,
+        # Auswahl und Ausschlüsse die der aktuellen Sprache
+        self.character_grid = CharacterGrid(
+            self.character_canvas, self.scrollbar, self.image_loader, self.img_dir,
+            self.placeholder_image, self.overlay_image,
+        )
+        self.character_grid.on_select = lambda name: self.select_character(self.localize_character(name))
+        self.character_grid.on_toggle_exclusion = lambda name: self.toggle_exclusion(self.localize_character(name))
+
         # Lade die Charaktere
         self.load_characters()
 
         # Aktualisiere Texte basierend auf Sprache
         self.update_texts()
+        self.update_suggestions()
 
-    def load_characters(self):
-        row_limit = 12
-        current_row = 0
-        current_column = 0
+        # Nach Updates suchen, ohne den Start aufzuhalten
+        if not os.environ.get(NO_UPDATE_ENV):
+            threading.Thread(target=stage_asset_update, daemon=True).start()
 
-        for file in os.listdir(self.img_dir):
-            if file.endswith(".jpg"):
-                char_name = file.replace(".jpg", "")
-                self.create_character_button(char_name, current_row, current_column)
+        if os.environ.get(STARTUP_PROBE_ENV):
+            print("STARTUP_READY", flush=True)
+            self.root.destroy()
 
-                current_column += 1
-                if current_column >= row_limit:
-                    current_column = 0
-                    current_row += 1
+    def show_startup_error(self, error):
+        """
+        Meldet, dass data.json fehlt oder ungültig ist; ohne Daten bleiben die Funktionen gesperrt.
+        """
+        message = (
+            f"Card data could not be loaded:\n{error}" if self.language == "EN"
+            else f"Kartendaten konnten nicht geladen werden:\n{error}"
+        )
+        self.info_label.config(text=message)
+        if os.environ.get(STARTUP_PROBE_ENV):
+            print(message, file=sys.stderr, flush=True)
+            self.root.destroy()
+            return
+        messagebox.showerror("TitanWar Combo Helper", message, parent=self.root)
+
+    def load_team_slots(self):
+        """
+        Lädt die sechs Teams der Team-Buttons aus der Bibliothek.
 
-    def create_character_button(self, name, row, column):
-        try:
-            localized_name = get_localized_image_name(name, self.language, data)
-            img_path = os.path.join(self.img_dir, f"{localized_name}.jpg")
-            
-            photo = load_image(img_path, (80, 80))
-            btn = Button(self.inner_frame, image=photo, text=name, compound="top")
-            btn.image = photo
-            btn.grid(row=row, column=column, padx=5, pady=5)
-
-            # Linksklick: Auswählen/Abwählen, Rechtsklick: Ausschließen/Wieder aufnehmen
-            btn.bind("<Button-1>", lambda e: self.select_character(name))
-            btn.bind("<Button-3>", lambda e: self.toggle_exclusion(name, btn))
-
-            # Overlay anwenden, falls Charakter ausgeschlossen ist
-            if name in self.excluded_characters:
-                self.add_overlay(btn)
+        Teams aus älteren Versionen stehen noch in der Konfigurationsdatei; sie
+        werden einmalig in die Bibliothek übernommen und dort entfernt.
+        """
+        self.team_library.bind(data)
+        legacy_teams = {team_name: characters for team_name, characters in self.config_store.teams.items() if characters}
+        if legacy_teams:
+            self.team_library.save_teams(legacy_teams, self.language)
+        if self.config_store.teams:
+            self.config_store.update(self.language, self.excluded_characters, teams={})
+        self.teams = self.team_library.load_teams(self.team_buttons, self.language)
 
-        except Exception as e:
-            print(f"Fehler beim Laden des Bildes für {name}: {e}")
+    def load_characters(self):
+        """
+        Liest die Charakterbilder ein und übergibt sie dem virtualisierten Raster.
+        """
+        names = [file[:-len(".jpg")] for file in assets.listdir(self.img_dir) if file.endswith(".jpg")]
+        excluded = [name for name in names if self.localize_character(name) in self.excluded_characters]
+        self.character_grid.set_characters(names, excluded)
+
+    def localize_character(self, canonical_name):
+        """
+        Übersetzt einen kanonischen Charakternamen in die aktuelle Sprache.
+        """
+        return translations.translate(canonical_name, CANONICAL_LANGUAGE, self.language)
 
     def select_character(self, name):
         if name in self.selected_characters:
@@ -102,141 +266,99 @@ class CardSelectorApp:
                 self.selected_characters.append(name)
         self.update_selection()
 
-    def toggle_exclusion(self, name, button):
+    def toggle_exclusion(self, name):
         """
         Aktiviert/Deaktiviert einen Charakter und aktualisiert die Anzeige.
         """
         if name in self.excluded_characters:
             self.excluded_characters.remove(name)
-            self.remove_overlay(button)
+            excluded = False
         else:
             self.excluded_characters.add(name)
-            self.add_overlay(button)
+            excluded = True
+
+        # Das Raster blendet nur das Overlay-Element ein oder aus
+        self.character_grid.set_excluded(get_localized_image_name(name, self.language, data), excluded)
 
         # Speichere die Änderungen in der Konfigurationsdatei
-        save_config(CONFIG_FILE, self.language, self.excluded_characters, self.teams)
+        self.config_store.update(self.language, self.excluded_characters)
         self.update_selection()
 
-
-
-    def add_overlay(self, button):
+    def update_selection(self):
         """
-        Fügt ein Overlay-Bild über den Charakterbutton.
+        Aktualisiert die Anzeige der ausgewählten Charaktere und der aktivierten Karten.
+
+        Die Aktivierung wird sofort berechnet; die Anzeige wird nur einmal pro
+        Leerlaufzyklus neu gezeichnet, sodass schnelle Klicks zusammengefasst werden.
         """
-        char_name = button.cget("text")
-        img_path = os.path.join(self.img_dir, f"{char_name}.jpg")
-        if self.overlay_path:
-            overlay_image = combine_images(img_path, self.overlay_path, (80, 80))
-            if overlay_image:
-                button.configure(image=overlay_image)
-                button.image = overlay_image
+        if self.activation_index is None:
+            return  # Daten noch nicht geladen
+        # Aktivierte Karten inkrementell aktualisieren
+        self.activation_index.set_selection(self.selected_characters)
+        self.activated_cards = self.activation_index.activated_cards()
 
-    def remove_overlay(self, button):
+        if not self.redraw_pending:
+            self.redraw_pending = True
+            self.root.after_idle(self.redraw_selection)
+
+    def redraw_selection(self):
         """
-        Entfernt das Overlay und stellt das Originalbild wieder her.
+        Gleicht die Anzeige mit der aktuellen Auswahl ab; nur geänderte Plätze werden umkonfiguriert.
         """
-        char_name = button.cget("text")
-        img_path = os.path.join(self.img_dir, f"{char_name}.jpg")
-        try:
-            photo = load_image(img_path, (80, 80))
-            button.configure(image=photo)
-            button.image = photo
-        except Exception as e:
-            print(f"Fehler beim Wiederherstellen des Bildes für {char_name}: {e}")
-
-    def update_selection(self):
+        self.redraw_pending = False
+        self.selection_view.show_selection([
+            (char, get_localized_image_name(char, self.language, data)) for char in self.selected_characters
+        ])
+        self.selection_view.show_cards(self.activated_cards, self.language)
+        self.update_suggestions()
+
+    def update_suggestions(self):
         """
-        Aktualisiert die Anzeige der ausgewählten Charaktere und der aktivierten Karten.
+        Zeigt Charaktere an, die weitere Karten aktivieren würden, und Karten,
+        denen nur noch ein oder zwei Charaktere fehlen.
         """
-        # Aktualisiere die Anzeige der ausgewählten Charaktere
-        for widget in self.selected_characters_frame.winfo_children():
-            widget.destroy()
-
-        positions = ["center", "left", "right", "center", "left", "right"]
-        rows = [0, 0, 0, 1, 1, 1]
-
-        for index, char in enumerate(self.selected_characters):
-            img_path = os.path.join(self.img_dir, f"{char}.jpg")
-            try:
-                photo = load_image(img_path, (80, 80))
-                lbl = Button(
-                    self.selected_characters_frame,
-                    image=photo,
-                    text=char,
-                    compound="top",
-                    command=lambda c=char: self.select_character(c),
-                )
-                lbl.image = photo
-                lbl.grid(row=rows[index], column=positions.index(positions[index]), padx=5, pady=5)
-            except Exception as e:
-                print(f"Fehler beim Anzeigen des Bildes für {char}: {e}")
-
-        # Aktivierte Karten aktualisieren
-        self.activated_cards = activate_cards(data, self.selected_characters, self.language)
-
-        # Entferne alte Kartenbuffs
-        for widget in self.activated_cards_frame.winfo_children():
-            widget.destroy()
+        # Ausgeschlossene Charaktere und Mitglieder anderer Teams nicht vorschlagen
+        current_team = self.team_var.get()
+        blocked = set(self.excluded_characters)
+        for team_name, team_chars in self.teams.items():
+            if team_name != current_team:
+                blocked.update(team_chars)
+
+        if len(self.selected_characters) < 6:
+            suggestions = self.activation_index.suggestions(blocked)
+        else:
+            suggestions = []
+        self.selection_view.show_suggestions(suggestions)
 
-        # Neue Kartenbuffs anzeigen
-        for index, card in enumerate(self.activated_cards):
-            buff_image_path = os.path.join(BUFFS_DIR, f"{card['name']['DE']}.jpg")  # Bild immer auf DE basieren
-            try:
-                if os.path.exists(buff_image_path):
-                    buff_photo = load_image(buff_image_path, (50, 50))
-                    frame = Frame(self.activated_cards_frame)
-                    frame.grid(row=0, column=index, padx=5, pady=5)
-
-                    img_label = Label(frame, image=buff_photo)
-                    img_label.image = buff_photo
-                    img_label.pack(side="top")
-
-                    # Buff-Name und Typ in der ausgewählten Sprache anzeigen
-                    text_label = Label(
-                        frame,
-                        text=f"{card['name'][self.language]} ({card['type'][self.language]})"
-                    )
-                    text_label.pack(side="top")
-                else:
-                    Label(
-                        self.activated_cards_frame,
-                        text=f"{card['name'][self.language]} ({card['type'][self.language]})"
-                    ).grid(row=0, column=index, padx=5, pady=5)
-            except Exception as e:
-                print(f"Fehler beim Anzeigen des Buff-Bildes für {card['name']['DE']}: {e}")
+        near_miss = self.activation_index.near_miss_cards()
+        self.near_miss_label.config(text="   ".join(
+            f"{card['name'][self.language]}: {', '.join(missing)}" for card, missing in near_miss
+        ))
 
     def autofill_characters(self):
-        def perform_calculation(update_callback):
+        if self.activation_index is None:
+            return  # Daten noch nicht geladen
+        # Wurde dieselbe Anfrage schon vollständig berechnet, gilt das Ergebnis ohne Fortschrittsfenster
+        available_characters = self.autofill_available_characters()
+        cached = self.cached_result("combination", available_characters, self.selected_characters)
+        if cached is not None:
+            self.apply_selection(list(set(self.selected_characters).union(cached))[:6])
+            return
+
+        def perform_calculation(update_callback, selected_type_key, card_type, available_characters, preselected):
             """
             Führt die Berechnungen für die Autofill-Funktion aus und aktualisiert den Fortschritt.
+            Alle Eingaben wurden vorher im Tk-Thread gelesen; hier werden keine Widgets abgefragt.
             """
+            language = calc_feedback.language
             try:
-                def translate_type(selected_type, language):
-                    type_mapping = {
-                        "EN": {"random": "random", "attack": "Angriff", "defense": "Verteidigung"},
-                        "DE": {"zufällig": "random", "angriff": "attack", "verteidigung": "defense"}
-                    }
-                    selected_type = selected_type.lower()
-                    translated = type_mapping.get(language, {}).get(selected_type, "random")
-                    return translated
-
-                total_steps = 10  # Geschätzte Schritte
+                total_steps = 6
                 current_step = 1
                 update_callback(current_step, total_steps, calc_feedback.translate("starting"))
 
-                # Ausgewählten Typ abrufen und übersetzen
-                selected_type_key = self.filter_var.get()
-                translated_type = translate_type(selected_type_key.lower(), self.language)
-
                 current_step += 1
                 update_callback(current_step, total_steps, calc_feedback.translate("steps_completed", current_step, total_steps))
 
-                # Verfügbare Charaktere sammeln
-                used_characters = {char for team_chars in self.teams.values() for char in team_chars}
-                available_characters = {
-                    char[self.language] for buff in data.values() for char in buff["characters"]
-                } - self.excluded_characters - used_characters
-
                 if not available_characters:
                     update_callback(current_step, total_steps, calc_feedback.translate("no_available_characters"))
                     return
@@ -245,11 +367,7 @@ class CardSelectorApp:
                 update_callback(current_step, total_steps, calc_feedback.translate("characters_collected", len(available_characters)))
 
                 # Filter gültige Karten
-                valid_cards = {
-                    card_name: card_info
-                    for card_name, card_info in data.items()
-                    if translated_type == "random" or card_info["type"][self.language].lower() == selected_type_key.lower()
-                }
+                valid_cards = data_model.cards_of_type(card_type)
 
                 if not valid_cards:
                     current_step += 1
@@ -260,54 +378,181 @@ class CardSelectorApp:
                 update_callback(current_step, total_steps, calc_feedback.translate("valid_buffs_filtered", len(valid_cards)))
 
                 # Berechnung der besten Kombination
-                preselected = set(self.selected_characters)
-                total_combinations = len(available_characters) ** 2  # Geschätzte Gesamtanzahl der Kombinationen
-                combinations_checked = 0
+                current_step += 1
+                update_callback(current_step, total_steps, calc_feedback.translate("calculating_best_combination", len(available_characters)))
+
+                def report_progress(nodes, best_score):
+                    update_callback(current_step, total_steps, calc_feedback.translate("search_progress", nodes, best_score))
+
+                deadline = time.monotonic() + SOLVER_TIME_BUDGET
+                best_combination = calculate_best_combination(
+                    data, available_characters, preselected, language, workers=SOLVER_WORKERS,
+                    progress_callback=report_progress,
+                    cancel_event=calc_feedback.cancel_event,
+                    deadline=deadline,
+                    card_type=card_type,
+                )
+                if not calc_feedback.cancel_event.is_set() and time.monotonic() < deadline:
+                    cache_key = result_cache.make_key(
+                        "combination", language, available_characters, preselected, valid_cards
+                    )
+                    result_cache.put(cache_key, language, best_combination)
 
-                if total_combinations == 0:
-                    current_step += 1
-                    update_callback(current_step, total_steps, calc_feedback.translate("no_combinations"))
+                if calc_feedback.discard_result:
+                    update_callback(current_step, total_steps, calc_feedback.translate("search_cancelled"))
                     return
+                if calc_feedback.cancel_event.is_set():
+                    update_callback(current_step, total_steps, calc_feedback.translate("search_stopped"))
 
-                current_step += 1
-                update_callback(current_step, total_steps, calc_feedback.translate("calculating_best_combination", total_combinations))
-
-                # Simulierte Kombinationenprüfung
-                for i in range(1, min(total_combinations, 10_000) + 1):  # Begrenze die Iterationen
-                    combinations_checked += 1
-                    if i % 1000 == 0 or i == total_combinations:
-                        update_callback(
-                            current_step, total_steps,
-                            calc_feedback.translate("calculations_done", combinations_checked, total_combinations)
-                        )
-                    time.sleep(0.001)  # Simuliert die Berechnungszeit
-
-                # Simulierte beste Kombination mit echten Namen
-                best_combination = calculate_best_combination(data, available_characters, preselected, self.language, valid_cards)
-                self.selected_characters = list(preselected.union(best_combination))[:6]
-                self.update_selection()
+                # Auswahl und Anzeige nur im Tk-Thread ändern
+                calc_feedback.call_in_ui(self.apply_selection, list(preselected.union(best_combination))[:6])
 
                 # Abschlussmeldung
                 current_step += 1
                 update_callback(current_step, total_steps, calc_feedback.translate("calculation_done"))
-                time.sleep(1)  # Halte das Fenster sichtbar
             except Exception as e:
                 update_callback(0, 1, calc_feedback.translate("error", str(e)))
 
-        # Fortschrittsanzeige starten
-        calc_feedback = CalculationFeedback(self.root, perform_calculation, language=self.language)
+        # Fortschrittsanzeige starten; Filter und Auswahl werden hier im Tk-Thread gelesen
+        calc_feedback = CalculationFeedback(
+            self.root, perform_calculation, self.language,
+            selected_type_key=self.filter_var.get(),
+            card_type=self.selected_card_type(),
+            available_characters=available_characters,
+            preselected=set(self.selected_characters),
+        )
+        calc_feedback.start()
+
+
+    def autofill_available_characters(self):
+        """
+        Charaktere, die weder ausgeschlossen noch einem Team zugeordnet sind.
+        """
+        used_characters = {char for team_chars in self.teams.values() for char in team_chars}
+        return translations.characters(self.language) - self.excluded_characters - used_characters
+
+    def cached_result(self, kind, available_characters, preselected, **params):
+        """
+        Gespeichertes Ergebnis einer vollständigen Suche mit denselben Eingaben oder None.
+        """
+        valid_cards = data_model.cards_of_type(self.selected_card_type())
+        if not available_characters or not valid_cards:
+            return None
+        cache_key = result_cache.make_key(kind, self.language, available_characters, preselected, valid_cards, **params)
+        return result_cache.get(cache_key, self.language)
+
+    def selected_card_type(self):
+        """
+        Typ-ID des im Pulldown-Menü gewählten Buff-Typs; None steht für alle Typen.
+        """
+        return self.filter_type_ids[self.language].get(self.filter_var.get())
+
+    def autofill_all_teams(self):
+        if self.activation_index is None:
+            return  # Daten noch nicht geladen
+        team_names = list(self.team_buttons.keys())
+
+        # Gespeicherte Aufteilung derselben Anfrage direkt übernehmen
+        available_characters = translations.characters(self.language) - self.excluded_characters
+        cached = self.cached_result("teams", available_characters, (), team_count=len(team_names))
+        if cached is not None:
+            self.apply_teams(team_names, cached)
+            return
+
+        def perform_calculation(update_callback, selected_type_key, card_type, available_characters):
+            """
+            Verteilt alle verfügbaren Charaktere gemeinsam auf alle sechs Teams.
+            Alle Eingaben wurden vorher im Tk-Thread gelesen; hier werden keine Widgets abgefragt.
+            """
+            language = calc_feedback.language
+            try:
+                total_steps = 4
+                update_callback(1, total_steps, calc_feedback.translate("starting"))
+
+                if not available_characters:
+                    update_callback(1, total_steps, calc_feedback.translate("no_available_characters"))
+                    return
+
+                update_callback(2, total_steps, calc_feedback.translate("characters_collected", len(available_characters)))
+
+                valid_cards = data_model.cards_of_type(card_type)
+                if not valid_cards:
+                    update_callback(2, total_steps, calc_feedback.translate("no_valid_buffs", selected_type_key))
+                    return
+
+                update_callback(3, total_steps, calc_feedback.translate("valid_buffs_filtered", len(valid_cards)))
+
+                def report_progress(nodes, best_score):
+                    update_callback(3, total_steps, calc_feedback.translate("search_progress", nodes, best_score))
+
+                deadline = time.monotonic() + SOLVER_TIME_BUDGET
+                best_teams = calculate_best_teams(
+                    data, available_characters, language, team_count=len(team_names),
+                    progress_callback=report_progress,
+                    cancel_event=calc_feedback.cancel_event,
+                    deadline=deadline,
+                    card_type=card_type,
+                )
+                if not calc_feedback.cancel_event.is_set() and time.monotonic() < deadline:
+                    cache_key = result_cache.make_key(
+                        "teams", language, available_characters, (), valid_cards, team_count=len(team_names)
+                    )
+                    result_cache.put(cache_key, language, best_teams)
+
+                if calc_feedback.discard_result:
+                    update_callback(3, total_steps, calc_feedback.translate("search_cancelled"))
+                    return
+                if calc_feedback.cancel_event.is_set():
+                    update_callback(3, total_steps, calc_feedback.translate("search_stopped"))
+                calc_feedback.call_in_ui(self.apply_teams, team_names, best_teams)
+
+                for team_name, characters in zip(team_names, best_teams):
+                    cards = activate_cards(valid_cards, characters, language)
+                    update_callback(3, total_steps, calc_feedback.translate("team_filled", team_name, len(cards)))
+
+                update_callback(4, total_steps, calc_feedback.translate("calculation_done"))
+            except Exception as e:
+                update_callback(0, 1, calc_feedback.translate("error", str(e)))
+
+        calc_feedback = CalculationFeedback(
+            self.root, perform_calculation, self.language,
+            selected_type_key=self.filter_var.get(),
+            card_type=self.selected_card_type(),
+            available_characters=available_characters,
+        )
         calc_feedback.start()
 
+    def apply_selection(self, characters):
+        """
+        Übernimmt eine berechnete Auswahl in die Anzeige.
+        """
+        self.selected_characters = characters
+        self.update_selection()
+
+    def apply_teams(self, team_names, teams):
+        """
+        Übernimmt eine berechnete Aufteilung und zeigt das aktuelle Team an.
+        """
+        for team_name, characters in zip(team_names, teams):
+            self.teams[team_name] = characters
+
+        # Einmal speichern, nachdem alle Teams gesetzt sind
+        self.team_library.save_teams(dict(zip(team_names, teams)), self.language)
+
+        self.selected_characters = list(self.teams.get(self.team_var.get(), []))
+        self.update_selection()
 
     def save_team(self):
         """
-        Speichert das aktuelle Team in der Konfigurationsdatei.
+        Speichert das aktuelle Team in der Teambibliothek.
         """
+        if self.activation_index is None:
+            return
         team_name = self.team_var.get()  # Aktuellen Team-Namen abrufen
-        self.teams[team_name] = self.selected_characters  # Speichere das Team
+        self.teams[team_name] = list(self.selected_characters)  # Speichere das Team
 
-        # Speichere alle Konfigurationsdaten
-        save_config(CONFIG_FILE, self.language, self.excluded_characters, self.teams)
+        # Mitglieder und aktivierte Karten in der Bibliothek ablegen
+        self.team_library.save_team(team_name, self.selected_characters, self.language)
 
         # Aktualisiere den Info-Text
         self.info_label.config(
@@ -316,13 +561,13 @@ class CardSelectorApp:
 
     def select_team(self, team_name):
         """
-        Wählt das angegebene Team aus der Konfigurationsdatei aus.
+        Wählt das angegebene Team aus den geladenen Teams aus.
         """
         # Aktualisiere die Auswahlvariable
         self.team_var.set(team_name)
 
         # Lade das Team aus dem gespeicherten Dictionary
-        self.selected_characters = self.teams.get(team_name, [])
+        self.selected_characters = list(self.teams.get(team_name, []))
 
         # Aktualisiere die Anzeige
         self.update_selection()
@@ -341,8 +586,29 @@ class CardSelectorApp:
         """
         Aktualisiert die Sprache des GUIs.
         """
+        if self.activation_index is None:
+            # Ohne Daten lassen sich Namen nicht übersetzen; Auswahl zurücksetzen
+            self.language_var.set(self.language)
+            return
+        previous_language = self.language
         self.language = self.language_var.get()
-        save_config(CONFIG_FILE, self.language, self.excluded_characters, self.teams)
+
+        # Auswahl, Ausschlüsse und Teams per Tabellenzugriff in die neue Sprache übersetzen
+        def translate(name):
+            return translations.translate(name, previous_language, self.language)
+
+        self.selected_characters = [translate(name) for name in self.selected_characters]
+        self.excluded_characters = {translate(name) for name in self.excluded_characters}
+        self.teams = {
+            team_name: [translate(name) for name in characters] for team_name, characters in self.teams.items()
+        }
+        # Die Bibliothek speichert kanonische IDs und bleibt daher unverändert
+        self.config_store.update(self.language, self.excluded_characters)
+
+        # Der Index arbeitet mit Namen der aktuellen Sprache
+        self.activation_index = CardActivationIndex(data, self.language)
+        self.activation_index.set_selection(self.selected_characters)
+        self.update_selection()
 
         # Aktualisiere alle Texte basierend auf der neuen Sprache
         self.update_texts()
@@ -354,6 +620,10 @@ class CardSelectorApp:
         # Labels aktualisieren
         self.selected_label.config(text="Selected Characters:" if self.language == "EN" else "Ausgewählte Charaktere:")
         self.cards_label.config(text="Activated Cards:" if self.language == "EN" else "Aktivierte Karten:")
+        self.suggestions_label.config(
+            text="Suggestions (+activated / one away after):" if self.language == "EN"
+            else "Vorschläge (+aktiviert / danach einen entfernt):"
+        )
         self.info_label.config(text=f"Current Team: {self.team_var.get()}" if self.language == "EN" else f"Aktuelles Team: {self.team_var.get()}")
 
         # Pulldown-Menü-Optionen aktualisieren
@@ -375,11 +645,11 @@ class CardSelectorApp:
         Setzt alle Teams zurück, indem alle Mitglieder aus den Teams entfernt werden.
         """
         # Alle Teams auf leere Listen setzen
-        for team_name in self.teams.keys():
+        for team_name in self.team_buttons:
             self.teams[team_name] = []
 
-        # Speichere die Änderungen in der Konfigurationsdatei
-        save_config(CONFIG_FILE, self.language, self.excluded_characters, self.teams)
+        # Die sechs Teams aus der Bibliothek entfernen; andere gespeicherte Teams bleiben erhalten
+        self.team_library.delete_teams(self.team_buttons)
 
         # Setze die aktuelle Auswahl zurück
         self.selected_characters = []
@@ -390,9 +660,28 @@ class CardSelectorApp:
             text="Alle Teams wurden zurückgesetzt!" if self.language == "DE" else "All teams have been reset!"
         )
 
+    def on_close(self):
+        """
+        Schreibt ausstehende Konfigurationsänderungen und schließt das Fenster.
+        """
+        self.config_store.close()
+        self.team_library.close()
+        self.image_loader.shutdown()
+        self.root.destroy()
+
+
+def report_first_frame(root):
+    """
+    Meldet startup_benchmark.py, dass das erste Fenster gezeichnet ist.
+    """
+    root.update()
+    print("STARTUP_FIRST_FRAME", flush=True)
+
 
 if __name__ == "__main__":
-    check_and_update_img()  # Verzeichnisprüfung und ggf. Update
+    multiprocessing.freeze_support()  # Für den Prozess-Pool in der PyInstaller-Version
     root = Tk()
-    app = CardSelectorApp(root)
+    app = CardSelectorApp(root)  # Verzeichnisprüfung und ggf. Update laufen im Hintergrund
+    if os.environ.get(STARTUP_PROBE_ENV):
+        root.after_idle(report_first_frame, root)
     root.mainloop()
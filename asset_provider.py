@@ -0,0 +1,182 @@
+#asset_provider.py:
+
+import io
+import os
+import re
+import threading
+import unicodedata
+
+# Bildverzeichnis und Archiv mit demselben Inhalt
+IMG_DIR = "./img"
+IMG_ZIP_FILE = "img.zip"
+
+# Maskierte Zeichen in Dateinamen, wie sie manche Entpacker erzeugen ("Kraftsto#U00df.jpg")
+_ESCAPE_PATTERN = re.compile(r"#U([0-9a-fA-F]{4})|#L([0-9a-fA-F]{6})")
+
+
+def unescape_name(name):
+    """
+    Löst ``#Uxxxx``/``#Lxxxxxx``-Maskierungen auf und normalisiert Unicode (NFC).
+    """
+    name = _ESCAPE_PATTERN.sub(lambda match: chr(int(match.group(1) or match.group(2), 16)), name)
+    return unicodedata.normalize("NFC", name)
+
+
+def escape_name(name):
+    """
+    Gegenstück zu ``unescape_name`` für Nicht-ASCII-Zeichen.
+    """
+    return "".join(
+        char if ord(char) < 128 else (f"#U{ord(char):04x}" if ord(char) <= 0xFFFF else f"#L{ord(char):06x}")
+        for char in name
+    )
+
+
+def normalize_path(path):
+    """
+    Pfad als Indexschlüssel: relativ, mit "/" getrennt, ohne Maskierungen.
+    """
+    return unescape_name(os.path.normpath(path).replace(os.sep, "/"))
+
+
+class AssetProvider:
+    """
+    Zugriff auf die Bilder unter ``img/``, entweder als lose Dateien oder direkt aus ``img.zip``.
+
+    Im Archivmodus wird das Archiv einmal geöffnet und sein zentrales
+    Verzeichnis indiziert; Einträge werden erst beim Zugriff gelesen. Die
+    Pfade bleiben dieselben wie bei losen Dateien (``./img/chars/Name.jpg``),
+    Maskierungen wie ``#U00df`` sind im Index bereits aufgelöst. Gelesen wird
+    unter einem Lock, dekodiert außerhalb, damit die Bild-Threads parallel
+    arbeiten können.
+    """
+
+    def __init__(self):
+        self.archive = None
+        self.archive_path = None
+        self.members = {}
+        self.children = {}
+        self.lock = threading.Lock()
+
+    def open_source(self, img_dir=IMG_DIR, zip_path=IMG_ZIP_FILE):
+        """
+        Wählt die Quelle: lose Dateien, falls ``img_dir/chars`` existiert, sonst das Archiv.
+
+        Returns:
+            bool: True, wenn Bilder verfügbar sind.
+        """
+        if os.path.isdir(os.path.join(img_dir, "chars")):
+            self.close()
+            return True
+        if os.path.exists(zip_path):
+            try:
+                self.use_archive(zip_path)
+                return True
+            except (OSError, ValueError) as e:
+                print(f"{zip_path} konnte nicht geöffnet werden: {e}")
+        return False
+
+    def use_archive(self, zip_path):
+        """
+        Öffnet ein Archiv und baut den Index aus seinem zentralen Verzeichnis.
+
+        Raises:
+            zipfile.BadZipFile: Wenn die Datei kein gültiges Archiv ist.
+        """
+        import zipfile  # erst bei Bedarf laden, hält den Programmstart kurz
+
+        archive = zipfile.ZipFile(zip_path, "r")
+        members = {}
+        children = {}
+        for info in archive.infolist():
+            key = normalize_path(info.filename.rstrip("/"))
+            parts = key.split("/")
+            for depth in range(1, len(parts)):
+                children.setdefault("/".join(parts[:depth]), set()).add(parts[depth])
+            if not info.is_dir():
+                members[key] = info
+
+        with self.lock:
+            self.close_archive()
+            self.archive = archive
+            self.archive_path = zip_path
+            self.members = members
+            self.children = children
+
+    def close(self):
+        with self.lock:
+            self.close_archive()
+
+    def close_archive(self):
+        # Aufrufer hält self.lock
+        if self.archive is not None:
+            self.archive.close()
+        self.archive = None
+        self.archive_path = None
+        self.members = {}
+        self.children = {}
+
+    def exists(self, path):
+        """
+        Wie ``os.path.exists`` für Bilddateien.
+        """
+        if self.archive is not None:
+            return normalize_path(path) in self.members
+        return self._loose_path(path) is not None
+
+    def listdir(self, directory):
+        """
+        Wie ``os.listdir``; Namen mit aufgelösten Maskierungen.
+        """
+        if self.archive is not None:
+            return sorted(self.children.get(normalize_path(directory), ()))
+        return sorted(unescape_name(name) for name in os.listdir(directory))
+
+    def open(self, path):
+        """
+        Öffnet ein Bild zum Lesen, z. B. für ``Image.open``.
+
+        Raises:
+            FileNotFoundError: Wenn das Bild nicht existiert.
+        """
+        if self.archive is not None:
+            info = self.members.get(normalize_path(path))
+            if info is None:
+                raise FileNotFoundError(path)
+            with self.lock:
+                content = self.archive.read(info)
+            return io.BytesIO(content)
+
+        loose_path = self._loose_path(path)
+        if loose_path is None:
+            raise FileNotFoundError(path)
+        return open(loose_path, "rb")
+
+    def signature(self, path):
+        """
+        Versionskennung eines Bilds für den Vorschau-Cache.
+        """
+        if self.archive is not None:
+            info = self.members.get(normalize_path(path))
+            if info is None:
+                raise FileNotFoundError(path)
+            return f"zip:{info.CRC:08x}:{info.file_size}"
+
+        loose_path = self._loose_path(path)
+        if loose_path is None:
+            raise FileNotFoundError(path)
+        stat = os.stat(loose_path)
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    @staticmethod
+    def _loose_path(path):
+        # Lose Dateien können maskiert entpackt worden sein ("Kraftsto#U00df.jpg")
+        if os.path.exists(path):
+            return path
+        directory, name = os.path.split(path)
+        escaped_path = os.path.join(directory, escape_name(name))
+        return escaped_path if escaped_path != path and os.path.exists(escaped_path) else None
+
+
+# Gemeinsame Quelle für alle Bilder
+assets = AssetProvider()
@@ -0,0 +1,218 @@
+#batch_solver.py:
+
+"""
+Kommandozeilen-Modus ohne GUI: berechnet die besten Teams für viele Spieler-Kader.
+
+Beispiel:
+    python batch_solver.py rosters.jsonl --workers 8 --teams 1 > results.jsonl
+
+Eingabe ist eine JSON-Datei (Liste von Kadern), JSON Lines (ein Kader pro Zeile)
+oder CSV mit den Spalten ``player``, ``owned``, ``excluded`` und optional
+``preselected``, ``type``, ``teams``, ``language``; Namen innerhalb einer
+CSV-Zelle werden durch ";" getrennt. Fehlt ``owned``, gelten alle Charaktere
+als vorhanden; vorausgewählte Charaktere (höchstens sechs) stehen immer im
+ersten Team. Ausgabe ist eine JSON-Zeile pro Spieler, sobald sie fertig ist.
+
+Importiert weder tkinter noch PIL.
+"""
+
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from character_utils import calculate_best_combination, calculate_best_teams, activate_cards, default_worker_count
+from data_model import load_data_model
+
+# Trennzeichen für Namenslisten in CSV-Zellen (Namen können Kommas enthalten)
+CSV_LIST_SEPARATOR = ";"
+
+# Plätze in einem Team
+TEAM_SIZE = 6
+
+# Aufträge pro Prozess, die gleichzeitig unterwegs sein dürfen
+IN_FLIGHT_PER_WORKER = 4
+
+# Datenmodell des aktuellen Prozesses, einmalig beim Start geladen
+_data_model = None
+
+
+def read_rosters(path):
+    """
+    Liest Kader aus JSON, JSON Lines oder CSV und liefert sie einzeln als Dicts.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8", newline="")
+    try:
+        if extension == ".csv":
+            for row in csv.DictReader(stream):
+                roster = {key.strip(): value for key, value in row.items() if key and value not in (None, "")}
+                for key in ("owned", "excluded", "preselected"):
+                    if key in roster:
+                        roster[key] = [name.strip() for name in roster[key].split(CSV_LIST_SEPARATOR) if name.strip()]
+                yield roster
+        elif extension == ".json":
+            yield from json.load(stream)
+        else:
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def resolve_card_type(data_model, value):
+    """
+    Typ-ID zu einer Angabe aus dem Kader: Typ-ID, Anzeigename in einer beliebigen
+    Sprache oder leer bzw. "random"/"zufällig" für alle Typen.
+
+    Raises:
+        ValueError: Wenn der Typ unbekannt ist.
+    """
+    if value in (None, "") or str(value).lower() in ("random", "zufällig", "all"):
+        return None
+    for type_id in data_model.type_ids:
+        names = [type_id] + list(data_model.type_names[type_id].values())
+        if str(value).lower() in (name.lower() for name in names):
+            return type_id
+    raise ValueError(f"Unbekannter Buff-Typ: {value}")
+
+
+def solve_roster(roster, defaults):
+    """
+    Berechnet das beste Team bzw. die besten Teams eines Kaders.
+
+    Args:
+        roster (dict): Kader mit ``player``, ``owned``, ``excluded`` usw.
+        defaults (dict): Standardwerte für ``language``, ``type``, ``teams`` und ``time_limit``.
+
+    Returns:
+        dict: Ergebniszeile für die Ausgabe.
+    """
+    data_model = _data_model
+    player = roster.get("player")
+    try:
+        language = roster.get("language", defaults["language"])
+        translations = data_model.translations
+        known = translations.characters(language)
+
+        owned = set(roster["owned"]) if "owned" in roster else set(known)
+        excluded = set(roster.get("excluded", ()))
+        preselected = set(roster.get("preselected", ()))
+        unknown = sorted((owned | excluded | preselected) - known)
+        available = (owned & known) - excluded - preselected
+        preselected &= known
+        if len(preselected) > TEAM_SIZE:
+            raise ValueError(f"Höchstens {TEAM_SIZE} vorausgewählte Charaktere erlaubt, nicht {len(preselected)}")
+
+        card_type = resolve_card_type(data_model, roster.get("type", defaults["type"]))
+        valid_cards = data_model.cards_of_type(card_type)
+        team_count = int(roster.get("teams", defaults["teams"]))
+
+        time_limit = defaults["time_limit"]
+        deadline = time.monotonic() + time_limit if time_limit else None
+        if team_count <= 1 or preselected:
+            # Vorausgewählte Charaktere stehen immer im ersten Team
+            teams = [sorted(preselected) + calculate_best_combination(
+                data_model.data, available, preselected, language, deadline=deadline, card_type=card_type
+            )]
+            available -= set(teams[0])
+            team_count -= 1
+        else:
+            teams = []
+        if team_count >= 1:
+            teams += calculate_best_teams(
+                data_model.data, available, language, team_count=team_count,
+                deadline=deadline, card_type=card_type,
+            )
+
+        result = {
+            "player": player,
+            "teams": teams,
+            "cards": [len(activate_cards(valid_cards, team, language)) for team in teams],
+            "complete": deadline is None or time.monotonic() < deadline,
+        }
+        if unknown:
+            result["unknown"] = unknown
+        return result
+    except Exception as e:
+        return {"player": player, "error": str(e)}
+
+
+def init_worker(data_file):
+    global _data_model
+    _data_model = load_data_model(data_file)
+
+
+def run_batch(rosters, data_file, defaults, workers=1, output=sys.stdout):
+    """
+    Löst alle Kader und schreibt jedes Ergebnis als JSON-Zeile, sobald es vorliegt.
+
+    Bei mehreren Prozessen sind nur begrenzt viele Kader gleichzeitig in Arbeit,
+    sodass auch sehr große Eingaben nicht vollständig im Speicher landen. Die
+    Ausgabereihenfolge entspricht dann der Fertigstellung; ``index`` verweist
+    auf die Position in der Eingabe.
+
+    Returns:
+        int: Anzahl der Kader mit Fehler.
+    """
+    errors = 0
+
+    def emit(index, result):
+        nonlocal errors
+        errors += "error" in result
+        output.write(json.dumps({"index": index, **result}, ensure_ascii=False) + "\n")
+        output.flush()
+
+    if workers <= 1:
+        init_worker(data_file)
+        for index, roster in enumerate(rosters):
+            emit(index, solve_roster(roster, defaults))
+        return errors
+
+    # Modell einmal im Hauptprozess bauen, damit die Prozesse nur die Cache-Datei laden
+    load_data_model(data_file)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(data_file,)) as executor:
+        pending = {}
+        for index, roster in enumerate(rosters):
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    emit(pending.pop(future), future.result())
+            pending[executor.submit(solve_roster, roster, defaults)] = index
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                emit(pending.pop(future), future.result())
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Berechnet die besten Teams für viele Kader ohne GUI.")
+    parser.add_argument("rosters", help="Kader als .json, .jsonl oder .csv ('-' liest JSON Lines von stdin)")
+    parser.add_argument("--data", default="data.json", help="Pfad zu data.json")
+    parser.add_argument("--output", "-o", help="Ausgabedatei (Standard: stdout)")
+    parser.add_argument("--workers", type=int, default=default_worker_count(), help="Anzahl der Prozesse")
+    parser.add_argument("--language", default="EN", help="Sprache der Namen (DE oder EN)")
+    parser.add_argument("--type", default=None, help="Buff-Typ (Typ-ID oder Anzeigename), Standard: alle")
+    parser.add_argument("--teams", type=int, default=1, help="Anzahl disjunkter Teams pro Spieler")
+    parser.add_argument("--time-limit", type=float, default=0, help="Zeitbudget pro Spieler in Sekunden (0 = ohne)")
+    args = parser.parse_args(argv)
+
+    defaults = {"language": args.language, "type": args.type, "teams": args.teams, "time_limit": args.time_limit}
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        errors = run_batch(read_rosters(args.rosters), args.data, defaults, args.workers, output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
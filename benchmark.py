@@ -0,0 +1,265 @@
+#benchmark.py:
+
+"""
+Benchmarks für Solver, Kartenaktivierung und Lokalisierung mit synthetischen Daten.
+
+Beispiel:
+    python benchmark.py --sizes 40x30,80x60,120x100 --output bench.json
+    python benchmark.py --baseline bench.json
+
+Die Daten werden reproduzierbar aus einem Seed erzeugt. Für jede Größe werden
+die Funktionen mehrfach gemessen (Durchsatz) und einmal unter ``tracemalloc``
+ausgeführt (Spitzenspeicher). Mit ``--baseline`` werden die Zeiten pro Aufruf
+mit einem früheren Lauf verglichen; langsamere Messungen jenseits der Toleranz
+gelten als Regression.
+"""
+
+import sys
+import json
+import time
+import random
+import itertools
+import argparse
+import platform
+import tracemalloc
+from character_utils import calculate_best_combination, calculate_best_teams, activate_cards, CardActivationIndex
+from data_model import get_data_model
+
+# Standardgrößen: Charaktere x Karten
+DEFAULT_SIZES = "40x30,80x60,120x100"
+
+# Anteil der Kartentypen in den synthetischen Daten (kanonischer Name, englischer Name, Gewicht)
+DEFAULT_TYPE_MIX = [("Angriff", "Attack", 0.7), ("Verteidigung", "Defense", 0.3)]
+
+
+def generate_data(roster_size, card_count, chars_per_card=(2, 4), type_mix=DEFAULT_TYPE_MIX, seed=1):
+    """
+    Erzeugt Kartendaten im Format von ``data.json``.
+
+    Args:
+        roster_size (int): Anzahl der Charaktere.
+        card_count (int): Anzahl der Karten.
+        chars_per_card (tuple): Kleinste und größte Anzahl Charaktere pro Karte.
+        type_mix (list): (Typ DE, Typ EN, Gewicht) je Kartentyp.
+        seed (int): Startwert des Zufallsgenerators.
+
+    Returns:
+        dict: Die Kartendaten; deutsche und englische Namen unterscheiden sich.
+    """
+    rng = random.Random(seed)
+    characters = [{"DE": f"Figur{index:04d}", "EN": f"Hero{index:04d}"} for index in range(roster_size)]
+    weights = [weight for _, _, weight in type_mix]
+    data = {}
+    for index in range(card_count):
+        size = rng.randint(chars_per_card[0], min(chars_per_card[1], roster_size))
+        type_de, type_en, _ = rng.choices(type_mix, weights)[0]
+        data[f"Karte{index:04d}"] = {
+            "name": {"DE": f"Karte{index:04d}", "EN": f"Card{index:04d}"},
+            "characters": [dict(char) for char in rng.sample(characters, size)],
+            "type": {"DE": type_de, "EN": type_en},
+        }
+    return data
+
+
+def measure(function, min_time, max_calls):
+    """
+    Ruft ``function`` wiederholt auf, bis ``min_time`` Sekunden oder ``max_calls`` Aufrufe erreicht sind.
+
+    Returns:
+        tuple: (Anzahl Aufrufe, Gesamtdauer in Sekunden, letztes Ergebnis).
+    """
+    calls = 0
+    result = None
+    start = time.perf_counter()
+    while True:
+        result = function()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or calls >= max_calls:
+            return calls, elapsed, result
+
+
+def peak_memory(function):
+    """
+    Spitzenspeicher eines einzelnen Aufrufs in KiB laut ``tracemalloc``.
+    """
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 1024
+
+
+def benchmark_cases(data, seed, solver_time_limit):
+    """
+    Die gemessenen Funktionen für einen Datensatz.
+
+    Returns:
+        list: Tupel aus (Name, Funktion, Höchstzahl Aufrufe).
+    """
+    rng = random.Random(seed)
+    translations = get_data_model(data).translations
+    names = sorted(translations.characters("EN"))
+    teams = itertools.cycle([rng.sample(names, 6) for _ in range(64)])
+    next_team = teams.__next__
+
+    def solve():
+        deadline = time.monotonic() + solver_time_limit
+        calculate_best_combination(data, names, set(), "EN", deadline=deadline)
+        return time.monotonic() < deadline
+
+    def solve_teams():
+        deadline = time.monotonic() + solver_time_limit
+        calculate_best_teams(data, names, "EN", team_count=6, deadline=deadline)
+        return time.monotonic() < deadline
+
+    index = CardActivationIndex(data, "EN")
+
+    def activation_index():
+        index.set_selection(next_team())
+        return index.activated_cards()
+
+    def localize():
+        # Lokalisierung über utils, wie in der GUI; importiert PIL erst bei Bedarf
+        from utils import get_localized_image_name
+        for name in next_team():
+            get_localized_image_name(name, "EN", data)
+
+    return [
+        ("calculate_best_combination", solve, 5),
+        ("calculate_best_teams", solve_teams, 3),
+        ("activate_cards", lambda: activate_cards(data, next_team(), "EN"), 100000),
+        ("CardActivationIndex.set_selection", activation_index, 100000),
+        ("get_localized_image_name", localize, 100000),
+    ]
+
+
+def run_benchmarks(sizes, seed, chars_per_card, min_time, solver_time_limit, only=None, type_mix=DEFAULT_TYPE_MIX):
+    """
+    Misst alle Fälle für alle Größen.
+
+    Returns:
+        list: Ein Ergebnis-Dict pro (Fall, Größe).
+    """
+    results = []
+    for roster_size, card_count in sizes:
+        data = generate_data(roster_size, card_count, chars_per_card, type_mix, seed)
+        for name, function, max_calls in benchmark_cases(data, seed, solver_time_limit):
+            if only and name not in only:
+                continue
+            try:
+                calls, elapsed, outcome = measure(function, min_time, max_calls)
+                peak_kib = peak_memory(function)
+            except ImportError as e:
+                print(f"{name}: übersprungen ({e})", file=sys.stderr)
+                continue
+            result = {
+                "name": name,
+                "roster": roster_size,
+                "cards": card_count,
+                "calls": calls,
+                "seconds": elapsed,
+                "seconds_per_call": elapsed / calls,
+                "calls_per_second": calls / elapsed if elapsed else None,
+                "peak_kib": round(peak_kib, 1),
+            }
+            if name.startswith("calculate_best"):
+                # False: Zeitlimit erreicht, die Messung entspricht dann nur dem Limit
+                result["complete"] = bool(outcome)
+            results.append(result)
+            print(
+                f"{name:36} {roster_size:>5}x{card_count:<5} {result['seconds_per_call'] * 1000:10.3f} ms/Aufruf "
+                f"{peak_kib:10.1f} KiB", file=sys.stderr,
+            )
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Vergleicht die Zeiten pro Aufruf mit einem früheren Lauf.
+
+    Returns:
+        list: Regressionen als Tupel (Name, Größe, Faktor).
+    """
+    previous = {(entry["name"], entry["roster"], entry["cards"]): entry for entry in baseline["results"]}
+    regressions = []
+    for entry in results:
+        key = (entry["name"], entry["roster"], entry["cards"])
+        old = previous.get(key)
+        if old is None or not old["seconds_per_call"]:
+            continue
+        factor = entry["seconds_per_call"] / old["seconds_per_call"]
+        size = f"{entry['roster']}x{entry['cards']}"
+        print(f"{entry['name']:36} {size:>11} {factor:6.2f}x gegenüber Baseline", file=sys.stderr)
+        if factor > 1 + tolerance:
+            regressions.append((entry["name"], size, factor))
+    return regressions
+
+
+def parse_sizes(text):
+    sizes = []
+    for part in text.split(","):
+        roster_size, card_count = part.lower().split("x")
+        sizes.append((int(roster_size), int(card_count)))
+    return sizes
+
+
+def parse_type_mix(text):
+    """
+    Liest "Angriff/Attack=0.7,Verteidigung/Defense=0.3"; ohne "/" gilt der Name für beide Sprachen.
+    """
+    type_mix = []
+    for part in text.split(","):
+        names, weight = part.split("=")
+        type_de, _, type_en = names.partition("/")
+        type_mix.append((type_de.strip(), (type_en or type_de).strip(), float(weight)))
+    return type_mix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks mit synthetischen Kartendaten.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Charaktere x Karten, kommagetrennt")
+    parser.add_argument("--chars-per-card", default="2-4", help="Charaktere pro Karte als Bereich, z. B. 2-4")
+    parser.add_argument("--type-mix", help="Kartentypen mit Gewicht, z. B. Angriff/Attack=0.7,Verteidigung/Defense=0.3")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--min-time", type=float, default=0.5, help="Mindestmessdauer pro Fall in Sekunden")
+    parser.add_argument("--solver-time-limit", type=float, default=20, help="Zeitlimit pro Suche in Sekunden")
+    parser.add_argument("--only", action="append", help="Nur diesen Fall messen (mehrfach möglich)")
+    parser.add_argument("--output", "-o", help="Ergebnisse als JSON speichern")
+    parser.add_argument("--baseline", help="Früheres Ergebnis zum Vergleich")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Erlaubte Verlangsamung, 0.25 = 25 %%")
+    args = parser.parse_args(argv)
+
+    low, high = (int(value) for value in args.chars_per_card.split("-"))
+    type_mix = parse_type_mix(args.type_mix) if args.type_mix else DEFAULT_TYPE_MIX
+    results = run_benchmarks(
+        parse_sizes(args.sizes), args.seed, (low, high), args.min_time, args.solver_time_limit, args.only, type_mix
+    )
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "chars_per_card": [low, high],
+            "type_mix": type_mix,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            regressions = compare(results, json.load(file), args.tolerance)
+        for name, size, factor in regressions:
+            print(f"Regression: {name} bei {size} ist {factor:.2f}x langsamer", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
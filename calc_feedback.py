@@ -1,7 +1,13 @@
+import queue
 import threading
 import tkinter as tk
 from tkinter import ttk
-import time
+
+# Abstand, in dem der Tk-Thread die Fortschrittsmeldungen abholt (ms)
+DRAIN_INTERVAL_MS = 50
+
+# Höchstzahl der Zeilen im Protokoll; ältere Zeilen werden entfernt
+MAX_LOG_LINES = 200
 
 class CalculationFeedback:
     def __init__(self, root, task_function, language="EN", *task_args, **task_kwargs):
@@ -26,6 +32,16 @@ class CalculationFeedback:
         self.progress_label = None
         self.progress_details = None
         self.countdown_label = None
+        self.cancel_button = None
+        self.best_button = None
+
+        # Wird gesetzt, um die Suche zu beenden; ``discard_result`` unterscheidet
+        # "Abbrechen" (Ergebnis verwerfen) von "Bestes bisher verwenden"
+        self.cancel_event = threading.Event()
+        self.discard_result = False
+
+        # Meldungen des Worker-Threads; nur der Tk-Thread verändert Widgets
+        self.events = queue.SimpleQueue()
 
         # Sprachübersetzungen
         self.translations = {
@@ -40,8 +56,13 @@ class CalculationFeedback:
                 "no_available_characters": "Keine verfügbaren Charaktere für Autofill.",
                 "no_valid_buffs": "Keine gültigen Buffs für den Typ '{}'.",
                 "no_combinations": "Keine Kombinationen zu prüfen.",
-                "calculating_best_combination": "Berechnung der besten Kombination... (Insgesamt: {})",
-                "calculations_done": "Berechnungen durchgeführt: {}/{}"
+                "calculating_best_combination": "Berechnung der besten Kombination... ({} Charaktere)",
+                "search_progress": "{} Knoten durchsucht, beste Lösung: {} Karten",
+                "search_stopped": "Suche beendet, bestes bisheriges Ergebnis wird verwendet.",
+                "search_cancelled": "Berechnung abgebrochen.",
+                "cancel": "Abbrechen",
+                "use_best": "Bestes bisher verwenden",
+                "team_filled": "{}: {} Karten aktiviert."
             },
             "EN": {
                 "starting": "Calculation starting...",
@@ -54,8 +75,13 @@ class CalculationFeedback:
                 "no_available_characters": "No available characters for autofill.",
                 "no_valid_buffs": "No valid buffs for type '{}'.",
                 "no_combinations": "No combinations to check.",
-                "calculating_best_combination": "Calculating the best combination... (Total: {})",
-                "calculations_done": "Calculations performed: {}/{}"
+                "calculating_best_combination": "Calculating the best combination... ({} characters)",
+                "search_progress": "{} nodes searched, best so far: {} cards",
+                "search_stopped": "Search stopped, using the best result so far.",
+                "search_cancelled": "Calculation cancelled.",
+                "cancel": "Cancel",
+                "use_best": "Use best so far",
+                "team_filled": "{}: {} cards activated."
             }
         }
 
@@ -108,43 +134,120 @@ class CalculationFeedback:
         )
         self.countdown_label.pack(pady=5)
 
-        self.progress_window.protocol("WM_DELETE_WINDOW", lambda: None)  # Fenster kann nicht geschlossen werden
+        buttons_frame = tk.Frame(self.progress_window)
+        buttons_frame.pack(pady=5)
+        self.best_button = tk.Button(buttons_frame, text=self.translate("use_best"), command=self.use_best_so_far)
+        self.best_button.pack(side="left", padx=5)
+        self.cancel_button = tk.Button(buttons_frame, text=self.translate("cancel"), command=self.cancel)
+        self.cancel_button.pack(side="left", padx=5)
+
+        # Schließen des Fensters entspricht "Abbrechen"
+        self.progress_window.protocol("WM_DELETE_WINDOW", self.cancel)
+
+    def cancel(self):
+        """
+        Beendet die Berechnung und verwirft ihr Ergebnis.
+        """
+        self.discard_result = True
+        self.stop_search()
+
+    def use_best_so_far(self):
+        """
+        Beendet die Berechnung und übernimmt das bis dahin beste Ergebnis.
+        """
+        self.stop_search()
+
+    def stop_search(self):
+        self.cancel_event.set()
+        for button in (self.best_button, self.cancel_button):
+            if button:
+                button.config(state="disabled")
 
     def update_progress(self, progress, total, message):
         """
-        Aktualisiert den Fortschritt.
+        Meldet einen Fortschritt; darf aus jedem Thread aufgerufen werden.
 
         Args:
             progress (int): Anzahl abgeschlossener Schritte.
             total (int): Gesamtanzahl der Schritte.
             message (str): Fortschrittsnachricht.
         """
-        if self.progress_bar:
+        self.events.put(("progress", progress, total, message))
+
+    def call_in_ui(self, function, *args):
+        """
+        Führt ``function(*args)`` beim nächsten Abholen im Tk-Thread aus.
+        """
+        self.events.put(("call", function, args))
+
+    def drain_events(self):
+        """
+        Holt alle wartenden Meldungen ab und aktualisiert die Widgets einmal pro Takt.
+        """
+        if not self.progress_window or not self.progress_window.winfo_exists():
+            return
+
+        latest = None
+        messages = []
+        finished = False
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event[0] == "progress":
+                latest = event[1:3]
+                messages.append(event[3])
+            elif event[0] == "call":
+                try:
+                    event[1](*event[2])
+                except Exception as e:
+                    # Ein fehlerhafter Aufruf darf die übrigen Meldungen und den nächsten Takt nicht verhindern
+                    messages.append(self.translate("error", str(e)))
+            elif event[0] == "done":
+                finished = True
+
+        if latest:
+            progress, total = latest
             self.progress_bar["maximum"] = total
             self.progress_bar["value"] = progress
-
-        if self.progress_label:
             self.progress_label.config(text=self.translate("steps_completed", progress, total))
+        if messages:
+            self.append_log(messages[-MAX_LOG_LINES:])
 
-        if self.progress_details:
-            self.progress_details.config(state="normal")
-            self.progress_details.insert("end", f"{message}\n")
-            self.progress_details.see("end")
-            self.progress_details.config(state="disabled")
+        if finished:
+            for button in (self.best_button, self.cancel_button):
+                button.config(state="disabled")
+            self.run_countdown(3)  # Zeige Countdown für 3 Sekunden
+        else:
+            self.root.after(DRAIN_INTERVAL_MS, self.drain_events)
+
+    def append_log(self, messages):
+        """
+        Hängt Meldungen in einem Schritt an das Protokoll an und kürzt es auf ``MAX_LOG_LINES``.
+        """
+        self.progress_details.config(state="normal")
+        self.progress_details.insert("end", "".join(f"{message}\n" for message in messages))
+        line_count = int(self.progress_details.index("end-1c").split(".")[0]) - 1
+        if line_count > MAX_LOG_LINES:
+            self.progress_details.delete("1.0", f"{line_count - MAX_LOG_LINES + 1}.0")
+        self.progress_details.see("end")
+        self.progress_details.config(state="disabled")
 
-    def run_countdown(self, countdown_time):
+    def run_countdown(self, remaining):
         """
-        Führt einen Countdown aus, bevor das Fenster geschlossen wird.
+        Zählt per ``after`` herunter und schließt dann das Fenster.
 
         Args:
-            countdown_time (int): Zeit in Sekunden, bevor das Fenster geschlossen wird.
+            remaining (int): Zeit in Sekunden, bevor das Fenster geschlossen wird.
         """
-        for remaining in range(countdown_time, 0, -1):
-            self.countdown_label.config(
-                text=self.translate("closing_window", remaining)
-            )
-            time.sleep(1)  # Warte 1 Sekunde
-        self.progress_window.destroy()  # Schließe das Fenster nach dem Countdown
+        if not self.progress_window.winfo_exists():
+            return
+        if remaining <= 0:
+            self.progress_window.destroy()  # Schließe das Fenster nach dem Countdown
+            return
+        self.countdown_label.config(text=self.translate("closing_window", remaining))
+        self.root.after(1000, self.run_countdown, remaining - 1)
 
     def run_task_in_thread(self):
         """
@@ -157,8 +260,8 @@ class CalculationFeedback:
             except Exception as e:
                 self.update_progress(0, 1, self.translate("error", str(e)))
             finally:
-                # Starte den Countdown-Timer nach Abschluss
-                self.run_countdown(3)  # Zeige Countdown für 3 Sekunden
+                # Countdown und Schließen übernimmt der Tk-Thread
+                self.events.put(("done",))
 
         threading.Thread(target=task_wrapper, daemon=True).start()
 
@@ -168,3 +271,4 @@ class CalculationFeedback:
         """
         self.show_progress_window()
         self.run_task_in_thread()
+        self.root.after(DRAIN_INTERVAL_MS, self.drain_events)
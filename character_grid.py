@@ -0,0 +1,189 @@
+#character_grid.py:
+
+import os
+
+
+class CharacterGrid:
+    """
+    Virtualisiertes Charakterraster auf einem Canvas.
+
+    Statt eines Buttons pro Porträt werden Bild-, Text- und Overlay-Elemente
+    direkt auf den Canvas gezeichnet, und zwar nur für Zeilen im sichtbaren
+    Bereich (plus einem kleinen Puffer). Klicks werden über die Koordinaten
+    einer Zelle und damit einem Charakter zugeordnet.
+    """
+
+    def __init__(self, canvas, scrollbar, image_loader, img_dir, placeholder_image, overlay_image=None,
+                 columns=12, image_size=(80, 80), padding=5, text_height=18, buffer_rows=2):
+        """
+        Args:
+            canvas (Canvas): Der Canvas, auf dem das Raster gezeichnet wird.
+            scrollbar (Scrollbar): Die zugehörige vertikale Scrollbar.
+            image_loader (BackgroundImageLoader): Lädt die Porträts im Hintergrund.
+            img_dir (str): Verzeichnis der Charakterbilder.
+            placeholder_image (PhotoImage): Bild, bis das Porträt geladen ist.
+            overlay_image (PhotoImage): Overlay für ausgeschlossene Charaktere.
+            columns (int): Anzahl der Spalten.
+            image_size (tuple): Größe eines Porträts (Breite, Höhe).
+            padding (int): Abstand um jedes Porträt.
+            text_height (int): Höhe der Namenszeile unter dem Porträt.
+            buffer_rows (int): Zusätzlich gezeichnete Zeilen ober- und unterhalb des Sichtbereichs.
+        """
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.image_loader = image_loader
+        self.img_dir = img_dir
+        self.placeholder_image = placeholder_image
+        self.overlay_image = overlay_image
+        self.columns = columns
+        self.image_size = image_size
+        self.padding = padding
+        self.cell_width = image_size[0] + 2 * padding
+        self.cell_height = image_size[1] + text_height + 2 * padding
+        self.buffer_rows = buffer_rows
+
+        self.names = []
+        self.positions = {}
+        self.excluded = set()
+        # Gezeichnete Zeilen: Zeilennummer -> {Name: (Bild-ID, Text-ID, Overlay-ID)}
+        self.realized_rows = {}
+        # Bilder der gezeichneten Zellen: Zeilennummer -> {Name: PhotoImage}. Der Canvas hält
+        # keine eigene Referenz; ohne sie würde ein aus dem image_cache verdrängtes Bild leer
+        self.row_photos = {}
+
+        self.on_select = None
+        self.on_toggle_exclusion = None
+
+        self.canvas.configure(yscrollcommand=self._on_view_changed)
+        self.canvas.bind("<Configure>", lambda e: self.refresh())
+        self.canvas.bind("<Button-1>", lambda e: self._on_click(e, self.on_select))
+        self.canvas.bind("<Button-3>", lambda e: self._on_click(e, self.on_toggle_exclusion))
+        self.canvas.bind("<MouseWheel>", self._on_mouse_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.canvas.yview_scroll(-1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.canvas.yview_scroll(1, "units"))
+
+    def set_characters(self, names, excluded=()):
+        """
+        Setzt die angezeigten Charaktere und zeichnet das Raster neu.
+
+        Args:
+            names (list): Kanonische Charakternamen in Anzeigereihenfolge.
+            excluded (iterable): Kanonische Namen der ausgeschlossenen Charaktere.
+        """
+        for row in list(self.realized_rows):
+            self._unrealize_row(row)
+        self.names = list(names)
+        self.positions = {name: index for index, name in enumerate(self.names)}
+        self.excluded = set(excluded)
+
+        rows = (len(self.names) + self.columns - 1) // self.columns
+        self.canvas.configure(
+            scrollregion=(0, 0, self.columns * self.cell_width, rows * self.cell_height),
+            yscrollincrement=self.cell_height // 4,
+        )
+        self.refresh()
+
+    def set_excluded(self, name, excluded):
+        """
+        Blendet das Overlay eines Charakters ein oder aus, ohne Bilder neu zu kombinieren.
+        """
+        if excluded:
+            self.excluded.add(name)
+        else:
+            self.excluded.discard(name)
+
+        index = self.positions.get(name)
+        if index is None:
+            return
+        items = self.realized_rows.get(index // self.columns, {}).get(name)
+        if items:
+            self.canvas.itemconfigure(items[2], state=self._overlay_state(name))
+
+    def _overlay_state(self, name):
+        return "normal" if name in self.excluded and self.overlay_image else "hidden"
+
+    def visible_rows(self):
+        """
+        Zeilenbereich, der sichtbar ist oder im Puffer liegt.
+        """
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), self.cell_height)
+        first = max(0, int(top // self.cell_height) - self.buffer_rows)
+        last = int((top + height) // self.cell_height) + self.buffer_rows
+        total_rows = (len(self.names) + self.columns - 1) // self.columns
+        return range(first, min(last + 1, total_rows))
+
+    def refresh(self):
+        """
+        Zeichnet neu sichtbare Zeilen und entfernt Zeilen außerhalb des Puffers.
+        """
+        wanted = set(self.visible_rows())
+        for row in list(self.realized_rows):
+            if row not in wanted:
+                self._unrealize_row(row)
+        for row in sorted(wanted):
+            if row not in self.realized_rows:
+                self._realize_row(row)
+
+    def _realize_row(self, row):
+        # Vor den Bildanfragen eintragen, da bereits geladene Bilder sofort zurückkommen
+        cells = self.realized_rows[row] = {}
+        self.row_photos[row] = {}
+        start = row * self.columns
+        for column, name in enumerate(self.names[start:start + self.columns]):
+            x = column * self.cell_width + self.padding
+            y = row * self.cell_height + self.padding
+            image_id = self.canvas.create_image(x, y, image=self.placeholder_image, anchor="nw")
+            text_id = self.canvas.create_text(
+                x + self.image_size[0] // 2, y + self.image_size[1] + 2, text=name, anchor="n"
+            )
+            overlay_id = self.canvas.create_image(
+                x, y, image=self.overlay_image or "", anchor="nw", state=self._overlay_state(name)
+            )
+            cells[name] = (image_id, text_id, overlay_id)
+
+            img_path = os.path.join(self.img_dir, f"{name}.jpg")
+            self.image_loader.request(
+                img_path, self.image_size, lambda photo, r=row, n=name: self._set_image(r, n, photo)
+            )
+
+    def _unrealize_row(self, row):
+        self.row_photos.pop(row, None)
+        for items in self.realized_rows.pop(row).values():
+            for item in items:
+                self.canvas.delete(item)
+
+    def _set_image(self, row, name, photo):
+        # Die Zeile kann inzwischen wieder aus dem Sichtbereich verschwunden sein
+        items = self.realized_rows.get(row, {}).get(name)
+        if items:
+            self.canvas.itemconfigure(items[0], image=photo)
+            self.row_photos[row][name] = photo
+
+    def name_at(self, x, y):
+        """
+        Ordnet Canvas-Koordinaten dem Charakter zu, dessen Zelle getroffen wurde.
+
+        Returns:
+            str | None: Kanonischer Name oder None außerhalb aller Zellen.
+        """
+        column = int(x // self.cell_width)
+        row = int(y // self.cell_height)
+        if x < 0 or y < 0 or column >= self.columns:
+            return None
+        index = row * self.columns + column
+        if index >= len(self.names):
+            return None
+        return self.names[index]
+
+    def _on_click(self, event, callback):
+        name = self.name_at(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        if name is not None and callback is not None:
+            callback(name)
+
+    def _on_view_changed(self, first, last):
+        self.scrollbar.set(first, last)
+        self.refresh()
+
+    def _on_mouse_wheel(self, event):
+        self.canvas.yview_scroll(-1 if event.delta > 0 else 1, "units")
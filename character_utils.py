@@ -1,9 +1,488 @@
 #character_utils.py:
 
-from itertools import combinations
+import os
+import copy
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from data_model import get_data_model
+
+# Alle wie viele Knoten Abbruch, Zeitlimit und Fortschritt geprüft werden
+CHECK_INTERVAL = 1024
+
+# So viele Knoten sucht ein Prozess allein, bevor ein Prozess-Pool gestartet wird.
+# Der Start eines Pools kostet (je nach Startmethode) 50 bis 500 ms; kleine Suchen
+# sind vorher fertig.
+SERIAL_NODE_BUDGET = 20 * CHECK_INTERVAL
+
+# Mindestabstand zwischen zwei Fortschrittsmeldungen in Sekunden
+PROGRESS_INTERVAL = 0.25
+
+
+class SearchStopped(Exception):
+    """
+    Wird ausgelöst, wenn eine Suche abgebrochen wurde oder ihr Zeitlimit erreicht hat.
+    """
+
+
+class NodeBudgetExceeded(Exception):
+    """
+    Wird ausgelöst, wenn die Suche in einem Prozess ihr Knotenbudget aufgebraucht hat.
+    """
+
+
+class SearchControl:
+    """
+    Abbruch, Zeitlimit und Fortschrittsmeldungen für eine laufende Suche.
+    """
+
+    def __init__(self, progress_callback=None, cancel_event=None, deadline=None):
+        """
+        Args:
+            progress_callback (callable): Wird mit (besuchte Knoten, beste Kartenzahl) aufgerufen.
+            cancel_event (threading.Event): Beendet die Suche, sobald es gesetzt ist.
+            deadline (float): Zeitpunkt laut ``time.monotonic()``, an dem die Suche endet.
+        """
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+        self.deadline = deadline
+        self.nodes = 0
+        # Untergrenze für die gemeldete Kartenzahl (z. B. bereits feste Teams)
+        self.score_floor = 0
+        self.stopped = False
+        self.last_report = 0.0
+
+    def should_stop(self):
+        """
+        Prüft, ob abgebrochen wurde oder das Zeitlimit erreicht ist.
+        """
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            self.stopped = True
+        elif self.deadline is not None and time.monotonic() >= self.deadline:
+            self.stopped = True
+        return self.stopped
+
+    def report(self, best_score, force=False):
+        """
+        Meldet den Fortschritt, höchstens alle ``PROGRESS_INTERVAL`` Sekunden.
+        """
+        now = time.monotonic()
+        if self.progress_callback and (force or now - self.last_report >= PROGRESS_INTERVAL):
+            self.last_report = now
+            self.progress_callback(self.nodes, max(best_score, self.score_floor))
+
+    def check(self, nodes, best_score):
+        """
+        Verbucht ``nodes`` neue Knoten und beendet die Suche bei Bedarf.
+
+        Raises:
+            SearchStopped: Wenn abgebrochen wurde oder das Zeitlimit erreicht ist.
+        """
+        self.nodes += nodes
+        self.report(best_score)
+        if self.should_stop():
+            raise SearchStopped()
+
+
+class SolverModel:
+    """
+    Kompiliertes Modell für die Kombinationssuche.
+
+    Jeder Charakter erhält eine ganzzahlige ID, jede Karte wird einmalig als
+    Bitmaske ihrer benötigten Charaktere abgelegt. Eine Kombination ist damit
+    eine einzige Ganzzahl und eine Karte ist aktiv, wenn ``mask & req == req``.
+    """
+
+    def __init__(self, valid_cards, language, characters, data_model=None):
+        """
+        Args:
+            valid_cards (dict): Gefilterte Buffs, die berücksichtigt werden sollen.
+            language (str): Die aktuelle Sprache ('DE' oder 'EN').
+            characters (iterable): Alle Charaktere, die in einer Kombination vorkommen dürfen.
+            data_model (DataModel): Kompilierte Kartendaten; Charakter-IDs und
+                Kartenmasken werden dann direkt aus dessen Tabellen übernommen.
+        """
+        self.names = sorted(characters)
+        self.ids = {}
+        self.card_names = []
+        self.card_masks = []
+
+        # Mit Datenmodell gelten dessen IDs; Charaktere ohne Karte erhalten freie IDs dahinter
+        next_id = len(data_model.character_ids) if data_model else 0
+        for name in self.names:
+            char_id = data_model.character_id(name, language) if data_model else None
+            if char_id is None:
+                char_id = next_id
+                next_id += 1
+            self.ids[name] = char_id
+        allowed_mask = self.mask_of(self.names)
+
+        for card_name, card_info in valid_cards.items():
+            card_id = data_model.card_index.get(card_name) if data_model else None
+            if card_id is not None:
+                mask = data_model.card_masks[card_id]
+                if mask & ~allowed_mask:
+                    mask = None
+            else:
+                mask = self.mask_of(char[language] for char in card_info["characters"])
+            # Karten mit Charakteren außerhalb des Modells können nie aktiv werden
+            if mask is not None:
+                self.card_names.append(card_name)
+                self.card_masks.append(mask)
+
+    def mask_of(self, names):
+        """
+        Wandelt Charakternamen in eine Bitmaske um.
+
+        Returns:
+            int | None: Die Bitmaske oder None, falls ein Name unbekannt ist.
+        """
+        mask = 0
+        for name in names:
+            char_id = self.ids.get(name)
+            if char_id is None:
+                return None
+            mask |= 1 << char_id
+        return mask
+
+    def names_of(self, mask):
+        """
+        Wandelt eine Bitmaske zurück in die Liste der Charakternamen.
+        """
+        return [name for name in self.names if mask >> self.ids[name] & 1]
+
+    def count_cards(self, mask):
+        """
+        Zählt die Karten, die von der Kombination ``mask`` aktiviert werden.
+        """
+        return sum(1 for req in self.card_masks if mask & req == req)
+
+
+# Gemeinsames Vielfaches von 1..6, damit Kartenanteile ganzzahlig bleiben
+_WEIGHT_SCALE = 60
+
+
+class BranchAndBound:
+    """
+    Exakte Suche nach der besten Kombination mit oberer Schranke.
+
+    Charaktere werden einzeln hinzugefügt. Für jeden Teilbaum wird abgeschätzt,
+    wie viele Karten mit den restlichen Plätzen höchstens noch aktiv werden
+    können. Teilbäume, die das bisher beste Team nicht schlagen können, werden
+    übersprungen.
+    """
+
+    def __init__(self, model, preselected_mask, candidates, slots, control=None):
+        """
+        Args:
+            model (SolverModel): Das kompilierte Kartenmodell.
+            preselected_mask (int): Bitmaske der bereits gesetzten Charaktere.
+            candidates (list): IDs der Charaktere, die hinzugefügt werden dürfen.
+            slots (int): Anzahl freier Plätze im Team.
+            control (SearchControl): Optionaler Abbruch und Fortschritt.
+        """
+        self.preselected_mask = preselected_mask
+        self.candidates = list(candidates)
+        self.slots = slots
+        self.control = control
+
+        # Nur Karten, die mit den freien Plätzen überhaupt erreichbar sind
+        candidate_mask = 0
+        for char_id in candidates:
+            candidate_mask |= 1 << char_id
+        self.card_masks = [
+            req for req in model.card_masks
+            if req & ~preselected_mask & ~candidate_mask == 0
+            and (req & ~preselected_mask).bit_count() <= slots
+        ]
+
+        # Charaktere ohne erreichbare Karte tragen nichts bei
+        degree = {char_id: 0 for char_id in candidates}
+        for req in self.card_masks:
+            for char_id in degree:
+                if req >> char_id & 1:
+                    degree[char_id] += 1
+        self.order = sorted(
+            (char_id for char_id in candidates if degree[char_id]),
+            key=lambda char_id: (-degree[char_id], char_id),
+        )
+
+        # suffix_masks[i]: alle Charaktere, die ab Position i noch wählbar sind
+        self.suffix_masks = [0] * (len(self.order) + 1)
+        for index in range(len(self.order) - 1, -1, -1):
+            self.suffix_masks[index] = self.suffix_masks[index + 1] | 1 << self.order[index]
+
+        self.best_score = 0
+        self.best_mask = preselected_mask
+        self.nodes = 0
+        self.stopped = False
+        # Wird in Fortschrittsmeldungen zur eigenen Kartenzahl addiert (z. B. andere Teams)
+        self.score_offset = 0
+        # Prozessübergreifend bester Wert, nur im parallelen Modus gesetzt (siehe rank_key)
+        self.shared_best = None
+        # Knotenbudget der Suche in einem Prozess (None = unbegrenzt) und der laufende Teilbaum
+        self.node_limit = None
+        self.current_branch = 0
+
+    def bound(self, mask, index, slots_left):
+        """
+        Bewertet einen Knoten.
+
+        Eine noch unvollständige Karte mit ``m`` fehlenden Charakteren verteilt
+        ihren Wert zu je ``1/m`` auf diese Charaktere. Wird sie fertig, sind alle
+        ``m`` Charaktere gewählt und haben zusammen genau 1 beigetragen. Die
+        Summe der ``slots_left`` größten Gewichte ist damit eine obere Schranke
+        für die noch hinzukommenden Karten.
+
+        Returns:
+            tuple: (aktive Karten, obere Schranke für den Teilbaum)
+        """
+        reachable = self.suffix_masks[index]
+        active = 0
+        weights = {}
+        for req in self.card_masks:
+            missing = req & ~mask
+            if not missing:
+                active += 1
+                continue
+            count = missing.bit_count()
+            if count > slots_left or missing & ~reachable:
+                continue
+            share = _WEIGHT_SCALE // count
+            while missing:
+                low = missing & -missing
+                weights[low] = weights.get(low, 0) + share
+                missing ^= low
+
+        gain = sum(sorted(weights.values(), reverse=True)[:slots_left]) // _WEIGHT_SCALE
+        return active, active + gain
+
+    def search(self, index, mask, slots_left):
+        """
+        Tiefensuche ab Position ``index`` der Charakterreihenfolge.
+        """
+        self.nodes += 1
+        if self.nodes % CHECK_INTERVAL == 0:
+            if self.control is not None:
+                self.control.check(CHECK_INTERVAL, self.score_offset + self.best_score)
+            if self.node_limit is not None and self.nodes >= self.node_limit:
+                raise NodeBudgetExceeded()
+        active, upper = self.bound(mask, index, slots_left)
+        if active > self.best_score:
+            self.best_score = active
+            self.best_mask = mask
+            self.publish_best(active)
+        if slots_left == 0 or upper <= self.best_score:
+            return
+        # Ein Gleichstand mit einem früheren Teilbaum reicht zum Abschneiden, mit einem
+        # späteren nicht; so bleibt das Ergebnis unabhängig von der Prozessreihenfolge
+        if self.shared_best is not None and self.rank_key(upper, self.current_branch) < self.shared_best.value:
+            return
+
+        for position in range(index, len(self.order)):
+            self.search(position + 1, mask | 1 << self.order[position], slots_left - 1)
+
+    def rank_key(self, score, position):
+        """
+        Vergleichswert für Ergebnisse verschiedener Teilbäume: höhere Kartenzahl
+        zuerst, bei Gleichstand der frühere Teilbaum.
+        """
+        return score * (len(self.order) + 1) + len(self.order) - position
+
+    def publish_best(self, score):
+        """
+        Meldet einen neuen besten Wert an die anderen Prozesse.
+        """
+        shared = self.shared_best
+        if shared is None:
+            return
+        key = self.rank_key(score, self.current_branch)
+        if key > shared.value:
+            with shared.get_lock():
+                if key > shared.value:
+                    shared.value = key
+
+    def search_root(self):
+        """
+        Wurzelknoten und danach die Teilbäume je erstem Charakter in Suchreihenfolge.
+        Entspricht ``search(0, ...)``, merkt sich aber den laufenden Teilbaum.
+        """
+        self.nodes += 1
+        active, upper = self.bound(self.preselected_mask, 0, self.slots)
+        if active > self.best_score:
+            self.best_score = active
+            self.best_mask = self.preselected_mask
+        if self.slots == 0 or upper <= self.best_score:
+            return
+        for position in range(len(self.order)):
+            self.search_branch(position)
+
+    def search_branch(self, position):
+        """
+        Durchsucht den Teilbaum, in dem ``order[position]`` der erste gewählte Charakter ist.
+        """
+        self.current_branch = position
+        self.search(position + 1, self.preselected_mask | 1 << self.order[position], self.slots - 1)
+
+    def run(self, workers=1):
+        """
+        Führt die Suche aus. Wird sie über ``control`` beendet, liefert sie das
+        bis dahin beste Team und setzt ``stopped``.
+
+        Mit mehreren Prozessen wird zunächst trotzdem im aktuellen Prozess
+        gesucht. Erst wenn dabei ``SERIAL_NODE_BUDGET`` Knoten verbraucht sind,
+        übernimmt ein Prozess-Pool die restlichen Teilbäume, ausgehend vom bis
+        dahin besten Team.
+
+        Args:
+            workers (int): Anzahl der Prozesse; 1 sucht nur im aktuellen Prozess.
+
+        Returns:
+            int: Bitmaske des besten Teams (inklusive vorausgewählter Charaktere).
+        """
+        self.node_limit = SERIAL_NODE_BUDGET if workers > 1 else None
+        try:
+            self.search_root()
+        except SearchStopped:
+            self.stopped = True
+        except NodeBudgetExceeded:
+            self.node_limit = None
+            if self.control is not None:
+                self.control.nodes += self.nodes % CHECK_INTERVAL
+            return self.run_parallel(workers, self.current_branch)
+        if self.control is not None:
+            self.control.nodes += self.nodes % CHECK_INTERVAL
+            self.control.report(self.score_offset + self.best_score, force=True)
+        return self.best_mask
+
+    def run_parallel(self, workers, first_position):
+        """
+        Verteilt die Teilbäume ab ``first_position`` auf einen Prozess-Pool.
+
+        Die Teilbäume davor hat die Suche im aktuellen Prozess bereits
+        vollständig durchsucht; ihr bestes Team ist der Startwert für alle
+        Worker, die damit von Anfang an genauso stark abschneiden. Jeder
+        Teilbaum liefert sein erstes Team, das den Startwert schlägt. Beim
+        Zusammenführen gewinnt die höchste Kartenzahl, bei Gleichstand der
+        Startwert bzw. der frühere Teilbaum. Das entspricht genau dem Ergebnis
+        der Suche in einem Prozess.
+        """
+        incumbent_score = self.best_score
+        incumbent_mask = self.best_mask
+
+        control = self.control
+        deadline = control.deadline if control is not None else None
+        # Der Startwert zählt wie ein Ergebnis aus dem Teilbaum first_position
+        shared_best = multiprocessing.Value("q", self.rank_key(incumbent_score, first_position))
+        stop_event = multiprocessing.Event()
+
+        # Rückruf und threading.Event lassen sich nicht an andere Prozesse übergeben
+        worker_solver = copy.copy(self)
+        worker_solver.control = None
+
+        results = {}
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_branch_worker,
+            initargs=(worker_solver, incumbent_score, incumbent_mask, shared_best, stop_event, deadline),
+        ) as executor:
+            pending = {
+                executor.submit(_search_branch_worker, position): position
+                for position in range(first_position, len(self.order))
+            }
+            while pending:
+                done, _ = wait(pending, timeout=PROGRESS_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    position = pending.pop(future)
+                    results[position] = future.result()
+                    self.nodes += results[position][2]
+                    if control is not None:
+                        control.nodes += results[position][2]
+
+                if control is None:
+                    continue
+                control.report(self.score_offset + shared_best.value // (len(self.order) + 1))
+                if not stop_event.is_set() and control.should_stop():
+                    # Laufende Teilbäume liefern ihr bisher bestes Team, wartende entfallen
+                    stop_event.set()
+                    self.stopped = True
+                    for future in list(pending):
+                        if future.cancel():
+                            del pending[future]
+
+        # Zusammenführen in Suchreihenfolge, damit Gleichstände deterministisch bleiben
+        for position in sorted(results):
+            score, mask, _, branch_stopped = results[position]
+            self.stopped |= branch_stopped
+            if score > self.best_score:
+                self.best_score = score
+                self.best_mask = mask
+        if control is not None:
+            control.report(self.score_offset + self.best_score, force=True)
+        return self.best_mask
+
+    def fill_slots(self, mask):
+        """
+        Füllt die Plätze auf, die nach der Suche noch frei sind.
+
+        Die Suche liefert nur Charaktere, die Karten vervollständigen. Aufgefüllt
+        wird deterministisch in Suchreihenfolge (meiste erreichbare Karten zuerst),
+        danach mit den übrigen Kandidaten in der Reihenfolge von ``candidates``.
+        """
+        free = self.slots - (mask & ~self.preselected_mask).bit_count()
+        for char_id in self.order + self.candidates:
+            if free <= 0:
+                break
+            if not mask >> char_id & 1:
+                mask |= 1 << char_id
+                free -= 1
+        return mask
+
+
+# Suchzustand im Worker-Prozess, einmalig per Initializer gesetzt
+_branch_solver = None
+_branch_incumbent = (0, 0)
+
+
+def _init_branch_worker(solver, incumbent_score, incumbent_mask, shared_best, stop_event, deadline):
+    global _branch_solver, _branch_incumbent
+    _branch_solver = solver
+    _branch_solver.shared_best = shared_best
+    _branch_solver.control = SearchControl(cancel_event=stop_event, deadline=deadline)
+    _branch_incumbent = (incumbent_score, incumbent_mask)
+
+
+def _search_branch_worker(position):
+    """
+    Durchsucht einen Teilbaum im Worker-Prozess.
+
+    Returns:
+        tuple: (beste Kartenzahl, Bitmaske, besuchte Knoten, abgebrochen)
+    """
+    solver = _branch_solver
+    solver.best_score, solver.best_mask = _branch_incumbent
+    solver.nodes = 0
+    try:
+        if solver.control.should_stop():
+            raise SearchStopped()
+        solver.search_branch(position)
+    except SearchStopped:
+        return solver.best_score, solver.best_mask, solver.nodes, True
+    return solver.best_score, solver.best_mask, solver.nodes, False
+
+
+def default_worker_count():
+    """
+    Standardanzahl der Such-Prozesse: alle Kerne bis auf einen für die GUI.
+    """
+    return max(1, (os.cpu_count() or 1) - 1)
+
 
 # Berechnung der besten Kombination
-def calculate_best_combination(data, available_characters, preselected, language, valid_cards):
+def calculate_best_combination(
+    data, available_characters, preselected, language, valid_cards=None, workers=1,
+    progress_callback=None, cancel_event=None, deadline=None, card_type=None
+):
     """
     Berechnet die beste Kombination von Charakteren, um die maximale Anzahl an Karten zu aktivieren.
 
@@ -13,28 +492,225 @@ def calculate_best_combination(data, available_characters, preselected, language
         preselected (set): Bereits vorausgewählte Charaktere.
         language (str): Die aktuelle Sprache ('DE' oder 'EN').
         valid_cards (dict): Gefilterte Buffs, die berücksichtigt werden sollen.
+            Ohne Angabe gelten die Karten des Typs ``card_type``.
+        workers (int): Anzahl der Prozesse für die parallele Suche.
+        progress_callback (callable): Erhält (besuchte Knoten, beste Kartenzahl).
+        cancel_event (threading.Event): Beendet die Suche vorzeitig.
+        deadline (float): Spätester Endzeitpunkt laut ``time.monotonic()``.
+        card_type (str): Typ-ID aus dem Datenmodell oder None für alle Typen.
 
     Returns:
-        list: Die beste Kombination von Charakteren.
+        list: Die beste Kombination von Charakteren, aufgefüllt auf alle freien
+        Plätze, soweit genug Charaktere verfügbar sind. Nach Abbruch oder
+        Zeitüberschreitung die beste bis dahin gefundene.
     """
     max_slots = 6  # Maximale Anzahl an Charakteren
-    max_cards = 0
-    best_combination = []
-
-    # Prüfe alle möglichen Kombinationen
-    for combo in combinations(available_characters, max_slots - len(preselected)):
-        combined_set = preselected.union(combo)
-        activated_cards = {
-            card_name
-            for card_name, card_info in valid_cards.items()
-            if set(char[language] for char in card_info["characters"]).issubset(combined_set)
-        }
+    slots = max_slots - len(preselected)
+    if slots <= 0:
+        return []
+
+    data_model = get_data_model(data)
+    if valid_cards is None:
+        valid_cards = data_model.cards_of_type(card_type)
+    model = SolverModel(valid_cards, language, set(available_characters) | set(preselected), data_model)
+    preselected_mask = model.mask_of(preselected)
+    candidates = [model.ids[name] for name in model.names if name not in preselected]
+
+    control = SearchControl(progress_callback, cancel_event, deadline)
+    solver = BranchAndBound(model, preselected_mask, candidates, slots, control)
+    best_mask = solver.fill_slots(solver.run(workers))
+    return model.names_of(best_mask & ~preselected_mask)
+
+
+def _bits(mask):
+    """
+    Liefert die gesetzten Bitpositionen einer Maske in aufsteigender Reihenfolge.
+    """
+    positions = []
+    while mask:
+        low = mask & -mask
+        positions.append(low.bit_length() - 1)
+        mask ^= low
+    return positions
 
-        if len(activated_cards) > max_cards:
-            max_cards = len(activated_cards)
-            best_combination = list(combo)
 
-    return best_combination
+class TeamPartitioner:
+    """
+    Verteilt einen Kader auf mehrere disjunkte Teams.
+
+    Startet mit einer exakten Suche Team für Team und verbessert das Ergebnis
+    anschließend per lokaler Suche: Tausch einzelner Charaktere zwischen Teams
+    und dem freien Pool, Neuberechnung einzelner Teams sowie gemeinsame
+    Neuberechnung von Teampaaren. Jeder Schritt wird nur übernommen, wenn die
+    exakt nachgezählte Gesamtzahl aktiver Karten steigt.
+    """
+
+    def __init__(self, model, pool_mask, team_count, team_size=6, max_rounds=50, control=None):
+        """
+        Args:
+            model (SolverModel): Das kompilierte Kartenmodell.
+            pool_mask (int): Bitmaske aller verfügbaren Charaktere.
+            team_count (int): Anzahl der Teams.
+            team_size (int): Maximale Größe eines Teams.
+            max_rounds (int): Obergrenze für Verbesserungsrunden.
+            control (SearchControl): Optionaler Abbruch und Fortschritt.
+        """
+        self.model = model
+        self.pool_mask = pool_mask
+        self.team_count = team_count
+        self.team_size = team_size
+        self.max_rounds = max_rounds
+        self.control = control
+        self.stopped = False
+        self.teams = []
+
+    def solve_team(self, free_mask, score_offset=0):
+        """
+        Exakt bestes Einzelteam aus den Charakteren in ``free_mask``.
+
+        Nach einem Abbruch ist es das beste bis dahin gefundene Team; es bleibt
+        gültig, daher dürfen die Verbesserungsschritte es weiterhin vergleichen.
+        """
+        solver = BranchAndBound(self.model, 0, _bits(free_mask), self.team_size, self.control)
+        solver.score_offset = score_offset
+        best_mask = solver.run()
+        self.stopped |= solver.stopped
+        return best_mask
+
+    def free_mask(self):
+        """
+        Bitmaske der Charaktere, die keinem Team zugeordnet sind.
+        """
+        used = 0
+        for team in self.teams:
+            used |= team
+        return self.pool_mask & ~used
+
+    def score(self, team):
+        return self.model.count_cards(team)
+
+    def total(self):
+        """
+        Gesamtzahl aktiver Karten über alle Teams.
+        """
+        return sum(self.score(team) for team in self.teams)
+
+    def improve_team(self, index):
+        """
+        Berechnet ein Team neu, während alle anderen Teams fest bleiben.
+        """
+        current = self.teams[index]
+        candidate = self.solve_team(self.free_mask() | current)
+        if self.score(candidate) > self.score(current):
+            self.teams[index] = candidate
+            return True
+        return False
+
+    def exchange(self, first, second):
+        """
+        Tauscht einzelne Charaktere zwischen zwei Teams oder verschiebt sie in
+        ein Team mit freien Plätzen.
+        """
+        team_a, team_b = self.teams[first], self.teams[second]
+        before = self.score(team_a) + self.score(team_b)
+        for x in _bits(team_a):
+            bit_x = 1 << x
+            for y in _bits(team_b):
+                bit_y = 1 << y
+                new_a = team_a & ~bit_x | bit_y
+                new_b = team_b & ~bit_y | bit_x
+                if self.score(new_a) + self.score(new_b) > before:
+                    self.teams[first], self.teams[second] = new_a, new_b
+                    return True
+            if team_b.bit_count() < self.team_size:
+                new_a = team_a & ~bit_x
+                new_b = team_b | bit_x
+                if self.score(new_a) + self.score(new_b) > before:
+                    self.teams[first], self.teams[second] = new_a, new_b
+                    return True
+        return False
+
+    def reoptimize_pair(self, first, second):
+        """
+        Berechnet zwei Teams gemeinsam aus ihren Charakteren und dem freien Pool neu.
+        """
+        team_a, team_b = self.teams[first], self.teams[second]
+        free = self.free_mask() | team_a | team_b
+        new_a = self.solve_team(free)
+        new_b = self.solve_team(free & ~new_a)
+        if self.score(new_a) + self.score(new_b) > self.score(team_a) + self.score(team_b):
+            self.teams[first], self.teams[second] = new_a, new_b
+            return True
+        return False
+
+    def run(self):
+        """
+        Führt Startlösung und lokale Suche aus.
+
+        Returns:
+            list: Bitmasken der Teams, absteigend nach aktiven Karten sortiert.
+        """
+        self.teams = []
+        for _ in range(self.team_count):
+            if self.stopped:
+                self.teams.append(0)
+            else:
+                self.teams.append(self.solve_team(self.free_mask(), self.total()))
+
+        for _ in range(self.max_rounds):
+            if self.stopped:
+                break
+            if self.control is not None:
+                self.control.score_floor = self.total()
+            improved = False
+            for index in range(self.team_count):
+                improved |= self.improve_team(index)
+            for first in range(self.team_count):
+                for second in range(self.team_count):
+                    if first != second:
+                        improved |= self.exchange(first, second)
+            for first in range(self.team_count):
+                for second in range(first + 1, self.team_count):
+                    improved |= self.reoptimize_pair(first, second)
+            if not improved:
+                break
+
+        return sorted(self.teams, key=lambda team: (-self.score(team), _bits(team)))
+
+
+def calculate_best_teams(
+    data, available_characters, language, valid_cards=None, team_count=6,
+    progress_callback=None, cancel_event=None, deadline=None, card_type=None
+):
+    """
+    Verteilt die verfügbaren Charaktere auf bis zu ``team_count`` disjunkte Teams,
+    sodass insgesamt möglichst viele Karten aktiviert werden.
+
+    Args:
+        data (dict): Die Datenstruktur, die Karten und benötigte Charaktere beschreibt.
+        available_characters (set): Alle verfügbaren Charaktere basierend auf der aktuellen Sprache.
+        language (str): Die aktuelle Sprache ('DE' oder 'EN').
+        valid_cards (dict): Gefilterte Buffs, die berücksichtigt werden sollen.
+            Ohne Angabe gelten die Karten des Typs ``card_type``.
+        team_count (int): Anzahl der zu füllenden Teams.
+        progress_callback (callable): Erhält (besuchte Knoten, aktive Karten aller Teams).
+        cancel_event (threading.Event): Beendet die Suche vorzeitig.
+        deadline (float): Spätester Endzeitpunkt laut ``time.monotonic()``.
+        card_type (str): Typ-ID aus dem Datenmodell oder None für alle Typen.
+
+    Returns:
+        list: Eine Liste mit ``team_count`` Charakterlisten (leere Teams möglich).
+        Nach Abbruch oder Zeitüberschreitung die beste bis dahin gefundene Aufteilung.
+    """
+    data_model = get_data_model(data)
+    if valid_cards is None:
+        valid_cards = data_model.cards_of_type(card_type)
+    model = SolverModel(valid_cards, language, available_characters, data_model)
+    pool_mask = model.mask_of(model.names)
+    control = SearchControl(progress_callback, cancel_event, deadline)
+    partitioner = TeamPartitioner(model, pool_mask, team_count, control=control)
+    return [model.names_of(team) for team in partitioner.run()]
+
 
 def activate_cards(data, selected_characters, language):
     """
@@ -62,3 +738,156 @@ def activate_cards(data, selected_characters, language):
     return activated_cards
 
 
+
+class CardActivationIndex:
+    """
+    Inkrementelle Kartenaktivierung über einen invertierten Index.
+
+    Für jeden Charakter sind die Karten hinterlegt, die ihn benötigen, für jede
+    Karte die Anzahl noch fehlender Charaktere. Auswählen oder Abwählen ändert
+    nur die Zähler der Karten dieses Charakters; die Liste aktiver Karten und
+    der Karten, denen ein oder zwei Charaktere fehlen, bleibt dadurch stets aktuell.
+    """
+
+    # Karten mit höchstens so vielen fehlenden Charakteren gelten als "knapp verfehlt"
+    NEAR_MISS_LIMIT = 2
+
+    def __init__(self, data, language):
+        """
+        Args:
+            data (dict): Die Datenstruktur, die Karten und benötigte Charaktere beschreibt.
+            language (str): Die Sprache der Charakternamen ("DE" oder "EN").
+        """
+        model = get_data_model(data)
+        self.cards = list(data.values())
+        self.required = [set(names) for names in model.required_names(language)]
+        self.cards_by_character = {}
+        for card_id, required in enumerate(self.required):
+            for name in required:
+                self.cards_by_character.setdefault(name, []).append(card_id)
+
+        self.missing = [len(required) for required in self.required]
+        self.selected = set()
+        self.activated = set()
+        # near_miss[n]: Karten, denen genau n Charaktere fehlen (1 <= n <= NEAR_MISS_LIMIT)
+        self.near_miss = {count: set() for count in range(1, self.NEAR_MISS_LIMIT + 1)}
+        for card_id, count in enumerate(self.missing):
+            if count in self.near_miss:
+                self.near_miss[count].add(card_id)
+
+    @property
+    def one_away(self):
+        return self.near_miss[1]
+
+    def _set_missing(self, card_id, count):
+        previous = self.missing[card_id]
+        self.missing[card_id] = count
+        if previous == 0:
+            self.activated.discard(card_id)
+        elif previous in self.near_miss:
+            self.near_miss[previous].discard(card_id)
+        if count == 0:
+            self.activated.add(card_id)
+        elif count in self.near_miss:
+            self.near_miss[count].add(card_id)
+
+    def select(self, name):
+        """
+        Markiert einen Charakter als ausgewählt.
+        """
+        if name in self.selected:
+            return
+        self.selected.add(name)
+        for card_id in self.cards_by_character.get(name, ()):
+            self._set_missing(card_id, self.missing[card_id] - 1)
+
+    def deselect(self, name):
+        """
+        Entfernt einen Charakter aus der Auswahl.
+        """
+        if name not in self.selected:
+            return
+        self.selected.remove(name)
+        for card_id in self.cards_by_character.get(name, ()):
+            self._set_missing(card_id, self.missing[card_id] + 1)
+
+    def set_selection(self, names):
+        """
+        Gleicht die Auswahl mit ``names`` ab und ändert nur die Differenz.
+        """
+        names = set(names)
+        for name in self.selected - names:
+            self.deselect(name)
+        for name in names - self.selected:
+            self.select(name)
+
+    def _card_entry(self, card_id):
+        card_info = self.cards[card_id]
+        return {
+            "name": card_info["name"],  # Vollständiges Name-Wörterbuch
+            "type": card_info["type"]   # Vollständiges Typ-Wörterbuch
+        }
+
+    def activated_cards(self):
+        """
+        Aktive Karten im selben Format und in derselben Reihenfolge wie ``activate_cards``.
+        """
+        return [self._card_entry(card_id) for card_id in sorted(self.activated)]
+
+    def one_away_cards(self):
+        """
+        Karten, denen genau ein Charakter fehlt, zusammen mit diesem Charakter.
+
+        Returns:
+            list: Tupel aus (Karte, fehlender Charakter).
+        """
+        return [
+            (self._card_entry(card_id), next(iter(self.required[card_id] - self.selected)))
+            for card_id in sorted(self.one_away)
+        ]
+
+    def near_miss_cards(self):
+        """
+        Karten, die schon teilweise erfüllt sind und denen höchstens
+        ``NEAR_MISS_LIMIT`` Charaktere fehlen, die knappsten zuerst.
+
+        Returns:
+            list: Tupel aus (Karte, sortierte Liste der fehlenden Charaktere).
+        """
+        return [
+            (self._card_entry(card_id), sorted(self.required[card_id] - self.selected))
+            for count, card_ids in sorted(self.near_miss.items())
+            for card_id in sorted(card_ids)
+            if count < len(self.required[card_id])
+        ]
+
+    def suggestions(self, blocked=(), limit=5):
+        """
+        Bewertet nicht ausgewählte Charaktere danach, wie viele Karten sie
+        sofort aktivieren bzw. auf einen fehlenden Charakter heranbringen.
+
+        Es werden nur die Karten aus ``near_miss`` betrachtet, nicht der
+        gesamte Kartenbestand.
+
+        Args:
+            blocked (set): Charaktere, die nicht vorgeschlagen werden dürfen
+                (ausgeschlossen oder in anderen Teams).
+            limit (int): Maximale Anzahl an Vorschlägen.
+
+        Returns:
+            list: Tupel aus (Charakter, aktivierte Karten, Karten danach nur noch einen entfernt).
+        """
+        completes = {}
+        closer = {}
+        for card_id in self.near_miss[1]:
+            for name in self.required[card_id] - self.selected:
+                completes[name] = completes.get(name, 0) + 1
+        for card_id in self.near_miss.get(2, ()):
+            for name in self.required[card_id] - self.selected:
+                closer[name] = closer.get(name, 0) + 1
+
+        ranked = sorted(
+            (name for name in completes.keys() | closer.keys() if name not in blocked),
+            key=lambda name: (-completes.get(name, 0), -closer.get(name, 0), name),
+        )
+        return [(name, completes.get(name, 0), closer.get(name, 0)) for name in ranked[:limit]]
@@ -0,0 +1,250 @@
+#data_model.py:
+
+import os
+import json
+import pickle
+import hashlib
+
+# Bei jeder Änderung am Aufbau des Modells erhöhen, damit alte Cache-Dateien neu erzeugt werden
+MODEL_VERSION = 3
+
+# Sprache der kanonischen Charakter-IDs; die Bilddateien sind danach benannt
+CANONICAL_LANGUAGE = "DE"
+
+
+class TranslationTable:
+    """
+    Übersetzungstabelle für Charakternamen, einmalig aus den Kartendaten aufgebaut.
+
+    (Sprache, Name) zeigt auf eine kanonische ID (den deutschen Namen), die
+    kanonische ID auf den Namen in jeder Sprache. Jede Abfrage ist ein
+    Wörterbuchzugriff.
+    """
+
+    def __init__(self, data):
+        """
+        Args:
+            data (dict): Kartendaten mit Übersetzungen.
+        """
+        self.canonical_ids = {}
+        self.names = {}
+        for card in data.values():
+            for char in card["characters"]:
+                canonical_id = char.get(CANONICAL_LANGUAGE)
+                if canonical_id is None or canonical_id in self.names:
+                    continue
+                self.names[canonical_id] = dict(char)
+                for language, name in char.items():
+                    self.canonical_ids.setdefault((language, name), canonical_id)
+
+        self.names_by_language = {}
+        for canonical_id, localized in self.names.items():
+            for language, name in localized.items():
+                self.names_by_language.setdefault(language, set()).add(name)
+
+    def canonical_id(self, name, language):
+        """
+        Kanonische ID eines Charakters oder None, falls unbekannt.
+        """
+        return self.canonical_ids.get((language, name))
+
+    def translate(self, name, source_language, target_language):
+        """
+        Übersetzt einen Charakternamen. Unbekannte Namen bleiben unverändert.
+        """
+        canonical_id = self.canonical_ids.get((source_language, name))
+        if canonical_id is None:
+            return name
+        return self.names[canonical_id].get(target_language, name)
+
+    def localize(self, canonical_id, language):
+        """
+        Name einer kanonischen ID in der angegebenen Sprache. Unbekannte IDs bleiben unverändert.
+        """
+        return self.names.get(canonical_id, {}).get(language, canonical_id)
+
+    def characters(self, language):
+        """
+        Alle Charakternamen in der angegebenen Sprache.
+        """
+        return set(self.names_by_language.get(language, ()))
+
+
+class DataModel:
+    """
+    Kompiliertes, geprüftes Modell der Kartendaten.
+
+    Charaktere und Karten erhalten feste ganzzahlige IDs (Reihenfolge wie in
+    ``data.json``), jede Karte eine Bitmaske ihrer benötigten Charaktere und
+    einen Typ. Dazu kommen die Übersetzungstabelle und Karten je Typ. Typ-IDs
+    sind die kanonischen Typnamen aus ``data.json``; neue Typen brauchen daher
+    keine Codeänderung. Das Modell wird per ``load_data_model`` neben
+    ``data.json`` zwischengespeichert.
+    """
+
+    def __init__(self, data):
+        """
+        Args:
+            data (dict): Kartendaten wie in ``data.json``.
+
+        Raises:
+            ValueError: Wenn eine Karte unvollständig ist.
+        """
+        validate_data(data)
+        self.data = data
+        self.translations = TranslationTable(data)
+
+        self.character_ids = list(self.translations.names)
+        self.character_index = {canonical_id: index for index, canonical_id in enumerate(self.character_ids)}
+
+        self.card_keys = list(data)
+        self.card_index = {card_key: index for index, card_key in enumerate(self.card_keys)}
+        self.card_required = []
+        self.card_masks = []
+        self.cards_by_type = {}
+        self.type_names = {}
+        for card_id, card_info in enumerate(data.values()):
+            required = tuple(
+                self.character_index[char[CANONICAL_LANGUAGE]] for char in card_info["characters"]
+            )
+            mask = 0
+            for char_id in required:
+                mask |= 1 << char_id
+            self.card_required.append(required)
+            self.card_masks.append(mask)
+
+            type_id = card_info["type"][CANONICAL_LANGUAGE]
+            self.cards_by_type.setdefault(type_id, []).append(card_id)
+            self.type_names.setdefault(type_id, dict(card_info["type"]))
+
+        # Karten je Typ als fertige Teilmengen für Filter und Solver; None steht für alle Typen
+        self.type_ids = list(self.cards_by_type)
+        self.type_cards = {None: data}
+        for type_id, card_ids in self.cards_by_type.items():
+            self.type_cards[type_id] = {self.card_keys[card_id]: data[self.card_keys[card_id]] for card_id in card_ids}
+
+        # Benötigte Charakternamen je Karte, pro Sprache erst bei Bedarf aufgebaut
+        self._required_names = {}
+
+    def character_id(self, name, language):
+        """
+        Ganzzahlige ID eines Charakters oder None, falls unbekannt.
+        """
+        canonical_id = self.translations.canonical_id(name, language)
+        return self.character_index.get(canonical_id)
+
+    def cards_of_type(self, type_id=None):
+        """
+        Karten eines Typs im Format von ``data.json``; ``None`` liefert alle Karten.
+        Unbekannte Typen ergeben ein leeres Dict.
+        """
+        return self.type_cards.get(type_id, {})
+
+    def type_name(self, type_id, language):
+        """
+        Anzeigename eines Typs in der angegebenen Sprache.
+        """
+        return self.type_names.get(type_id, {}).get(language, type_id)
+
+    def required_names(self, language):
+        """
+        Benötigte Charakternamen jeder Karte in der angegebenen Sprache.
+
+        Returns:
+            list: Pro Karten-ID ein Tupel von Namen.
+        """
+        names = self._required_names.get(language)
+        if names is None:
+            localized = [self.translations.localize(canonical_id, language) for canonical_id in self.character_ids]
+            names = [tuple(localized[char_id] for char_id in required) for required in self.card_required]
+            self._required_names[language] = names
+        return names
+
+
+def validate_data(data):
+    """
+    Prüft, ob jede Karte Name, Typ und Charaktere mit kanonischem Namen besitzt.
+
+    Raises:
+        ValueError: Mit dem Namen der ersten fehlerhaften Karte.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Die Kartendaten müssen ein JSON-Objekt sein.")
+    for card_key, card_info in data.items():
+        try:
+            if CANONICAL_LANGUAGE not in card_info["name"] or CANONICAL_LANGUAGE not in card_info["type"]:
+                raise KeyError(CANONICAL_LANGUAGE)
+            if not card_info["characters"]:
+                raise ValueError("keine Charaktere")
+            for char in card_info["characters"]:
+                char[CANONICAL_LANGUAGE]
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Karte '{card_key}' in den Kartendaten ist fehlerhaft: {e!r}") from None
+
+
+def model_cache_path(data_file):
+    """
+    Pfad der Cache-Datei zu einer Datendatei, z. B. "data.model" für "data.json".
+    """
+    return f"{os.path.splitext(data_file)[0]}.model"
+
+
+def load_data_model(data_file, cache_file=None):
+    """
+    Lädt das kompilierte Modell zu ``data_file``.
+
+    Die Cache-Datei enthält Modellversion, SHA-256 der JSON-Datei und das Modell.
+    Passen Version und Prüfsumme, wird das JSON nicht erneut geparst; sonst wird
+    das Modell neu gebaut und die Cache-Datei atomar ersetzt.
+
+    Returns:
+        DataModel: Das Modell, bereits für ``get_data_model`` registriert.
+    """
+    cache_file = cache_file or model_cache_path(data_file)
+    with open(data_file, "rb") as file:
+        raw = file.read()
+    digest = hashlib.sha256(raw).hexdigest()
+
+    model = None
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, "rb") as file:
+                version, cached_digest, cached_model = pickle.load(file)
+            if version == MODEL_VERSION and cached_digest == digest:
+                model = cached_model
+        except Exception as e:
+            print(f"Datenmodell-Cache {cache_file} ist unbrauchbar und wird neu erzeugt: {e}")
+
+    if model is None:
+        model = DataModel(json.loads(raw.decode("utf-8")))
+        temp_path = f"{cache_file}.tmp"
+        try:
+            with open(temp_path, "wb") as file:
+                pickle.dump((MODEL_VERSION, digest, model), file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, cache_file)
+        except OSError as e:
+            # Ohne Schreibrechte (z. B. gebündelte .exe) wird das Modell bei jedem Start gebaut
+            print(f"Datenmodell-Cache konnte nicht gespeichert werden: {e}")
+
+    _register(model)
+    return model
+
+
+# Zuletzt gebautes Modell samt den Daten, aus denen es stammt
+_model_cache = (None, None)
+
+
+def _register(model):
+    global _model_cache
+    _model_cache = (model.data, model)
+
+
+def get_data_model(data):
+    """
+    Gibt das Modell für ``data`` zurück und baut es nur beim ersten Aufruf für dieses Datenobjekt.
+    """
+    cached_data, model = _model_cache
+    if cached_data is not data:
+        model = DataModel(data)
+        _register(model)
+    return model
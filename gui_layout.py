@@ -2,6 +2,9 @@
 
 from tkinter import Frame, Canvas, Scrollbar, Label, Button, StringVar, OptionMenu, Radiobutton
 
+# Erster Eintrag im Typ-Pulldown: alle Kartentypen
+ALL_TYPES_LABELS = {"DE": "Zufällig", "EN": "Random"}
+
 def setup_gui_layout(app):
     """
     Baut das Hauptlayout der GUI auf.
@@ -20,12 +23,6 @@ def setup_gui_layout(app):
     app.scrollbar.pack(side="right", fill="y")
     app.character_canvas.configure(yscrollcommand=app.scrollbar.set)
 
-    app.inner_frame = Frame(app.character_canvas)
-    app.character_canvas.create_window((0, 0), window=app.inner_frame, anchor="nw")
-    app.inner_frame.bind(
-        "<Configure>", lambda e: app.character_canvas.configure(scrollregion=app.character_canvas.bbox("all"))
-    )
-
     # Unterer Bereich: Ausgewählte Charaktere und aktivierte Karten
     app.bottom_frame = Frame(app.root)
     app.bottom_frame.pack(side="bottom", fill="x")
@@ -40,13 +37,22 @@ def setup_gui_layout(app):
     app.activated_cards_frame = Frame(app.bottom_frame)
     app.activated_cards_frame.pack()
 
+    # Vorschläge: Charaktere, die Karten aktivieren oder näher heranbringen
+    app.suggestions_label = Label(app.bottom_frame, text="Vorschläge:")
+    app.suggestions_label.pack()
+    app.suggestions_frame = Frame(app.bottom_frame)
+    app.suggestions_frame.pack()
+    app.near_miss_label = Label(app.bottom_frame, text="", fg="gray", wraplength=1100, justify="center")
+    app.near_miss_label.pack()
+
     # Steuerungs-Buttons
     controls_frame = Frame(app.bottom_frame)
     controls_frame.pack(pady=10)
 
-    # Pulldown-Menü-Optionen basierend auf Sprache
-    app.filter_var = StringVar(value="Zufällig")
-    app.filter_options = {"DE": ["Zufällig", "Verteidigung", "Angriff"], "EN": ["Random", "Defense", "Attack"]}
+    # Pulldown-Menü; die Kartentypen kommen erst mit den Daten (setup_filter_options)
+    app.filter_type_ids = {language: {all_label: None} for language, all_label in ALL_TYPES_LABELS.items()}
+    app.filter_options = {language: list(options) for language, options in app.filter_type_ids.items()}
+    app.filter_var = StringVar(value=app.filter_options[app.language][0])
     app.filter_menu = OptionMenu(controls_frame, app.filter_var, *app.filter_options[app.language])
     app.filter_menu.pack(side="left", padx=5)
 
@@ -54,6 +60,10 @@ def setup_gui_layout(app):
     app.autofill_button = Button(controls_frame, text="Autofill", command=app.autofill_characters)
     app.autofill_button.pack(side="left", padx=5)
 
+    # Alle Teams gemeinsam füllen
+    app.fill_all_button = Button(controls_frame, text="Fill All", command=app.autofill_all_teams)
+    app.fill_all_button.pack(side="left", padx=5)
+
     # Team-Buttons
     app.team_var = StringVar(value="Team 1")
     app.team_buttons = {}
@@ -89,3 +99,16 @@ def setup_gui_layout(app):
         command=app.change_language
     ).pack(side="right", padx=5, pady=5)
 
+
+def setup_filter_options(app):
+    """
+    Füllt die Pulldown-Optionen aus den Kartentypen in data.json, je Sprache Anzeigename -> Typ-ID.
+    """
+    app.filter_type_ids = {
+        language: {
+            all_label: None,
+            **{app.data_model.type_name(type_id, language): type_id for type_id in app.data_model.type_ids},
+        }
+        for language, all_label in ALL_TYPES_LABELS.items()
+    }
+    app.filter_options = {language: list(options) for language, options in app.filter_type_ids.items()}
@@ -0,0 +1,196 @@
+#image_cache.py:
+
+import os
+import glob
+import hashlib
+import tempfile
+from collections import OrderedDict
+from asset_provider import assets
+
+# Standardobergrenze für zwischengespeicherte Bilder (Bytes, RGBA geschätzt)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Verzeichnis der vorberechneten Vorschaubilder, direkt neben den Bildern
+THUMBNAIL_DIR = "./img/.thumbs"
+
+
+class ImageCache:
+    """
+    Gemeinsamer Zwischenspeicher für fertige Bilder mit LRU-Verdrängung.
+
+    Schlüssel ist (Pfad, Größe, Overlay-Variante). Die Kosten eines Eintrags
+    werden als Breite * Höhe * 4 Bytes geschätzt; wird die Obergrenze
+    überschritten, fallen die am längsten nicht benutzten Einträge heraus.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            max_bytes (int): Speicherobergrenze in Bytes.
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.entries = OrderedDict()
+        self.existing_paths = {}
+
+    @staticmethod
+    def make_key(path, size, variant=None):
+        """
+        Normalisierter Schlüssel, damit "./img/x.jpg" und "img/x.jpg" zusammenfallen.
+        """
+        return os.path.normpath(path), tuple(size), variant
+
+    def get(self, key):
+        """
+        Liefert das Bild zu ``key`` oder None und markiert es als zuletzt benutzt.
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, image):
+        """
+        Legt ein Bild ab und verdrängt bei Bedarf alte Einträge.
+        """
+        width, height = key[1]
+        cost = width * height * 4
+        if key in self.entries:
+            self.current_bytes -= self.entries.pop(key)[1]
+        self.entries[key] = (image, cost)
+        self.current_bytes += cost
+        self.evict()
+        return image
+
+    def evict(self):
+        # Der zuletzt eingefügte Eintrag bleibt immer erhalten
+        while self.current_bytes > self.max_bytes and len(self.entries) > 1:
+            _, (_, cost) = self.entries.popitem(last=False)
+            self.current_bytes -= cost
+
+    def set_limit(self, max_bytes):
+        """
+        Ändert die Speicherobergrenze.
+        """
+        self.max_bytes = max_bytes
+        self.evict()
+
+    def exists(self, path):
+        """
+        Wie ``os.path.exists``, aber pro Pfad nur einmal geprüft (lose Datei oder Archiv).
+        """
+        path = os.path.normpath(path)
+        if path not in self.existing_paths:
+            self.existing_paths[path] = assets.exists(path)
+        return self.existing_paths[path]
+
+    def clear(self):
+        self.entries.clear()
+        self.existing_paths.clear()
+        self.current_bytes = 0
+
+
+# Gemeinsame Instanz für Charakterbilder, Overlays und Buff-Symbole
+image_cache = ImageCache()
+
+
+class ThumbnailCache:
+    """
+    Persistenter Speicher für verkleinerte (und ggf. mit Overlay kombinierte) Bilder.
+
+    Der Dateiname besteht aus einem festen Teil für (Quelle, Größe, Overlay)
+    und einem Versionsteil aus Änderungszeit und Dateigröße (im Archiv
+    Prüfsumme und Größe) von Quelle und Overlay. Ändert sich eine Quelle,
+    passt der Versionsteil nicht mehr; das Vorschaubild wird neu erzeugt und
+    die veraltete Datei gelöscht.
+    """
+
+    def __init__(self, cache_dir=THUMBNAIL_DIR):
+        """
+        Args:
+            cache_dir (str): Verzeichnis für die Vorschaubilder.
+        """
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def _digest(text):
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def _signature(path):
+        # Änderungszeit und Größe bei losen Dateien, Prüfsumme und Größe im Archiv
+        return assets.signature(path)
+
+    def cache_path(self, source_path, size, overlay_path=None):
+        """
+        Pfad des Vorschaubilds für die aktuelle Version der Quellen.
+        """
+        stable = self._digest(f"{os.path.abspath(source_path)}|{size[0]}x{size[1]}|{overlay_path or ''}")
+        version = self._signature(source_path)
+        if overlay_path:
+            version += "|" + self._signature(overlay_path)
+        return os.path.join(self.cache_dir, f"{stable}-{self._digest(version)}.png")
+
+    def load(self, source_path, size, overlay_path=None):
+        """
+        Lädt das Vorschaubild und erzeugt es bei Bedarf aus der Quelle.
+
+        Returns:
+            PIL.Image.Image: Das verkleinerte Bild.
+        """
+        from PIL import Image  # erst beim ersten Bild laden, hält den Programmstart kurz
+        cached_path = self.cache_path(source_path, size, overlay_path)
+        if os.path.exists(cached_path):
+            try:
+                with Image.open(cached_path) as img:
+                    img.load()
+                    return img
+            except OSError as e:
+                print(f"Vorschaubild {cached_path} ist beschädigt und wird neu erzeugt: {e}")
+
+        with assets.open(source_path) as file:
+            img = Image.open(file).resize(size)
+        if overlay_path:
+            with assets.open(overlay_path) as file:
+                overlay_image = Image.open(file).resize(size)
+            img = img.copy()
+            img.paste(overlay_image, (0, 0), overlay_image)
+        self.store(cached_path, img)
+        return img
+
+    def store(self, cached_path, img):
+        """
+        Schreibt ein Vorschaubild atomar und entfernt danach ältere Versionen.
+
+        Mehrere Bild-Threads können dasselbe Bild gleichzeitig speichern; jeder
+        schreibt deshalb in eine eigene temporäre Datei.
+        """
+        stable = os.path.basename(cached_path).split("-", 1)[0]
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(prefix=f"{stable}-", suffix=".tmp", dir=self.cache_dir)
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    img.save(file, format="PNG")
+                os.replace(temp_path, cached_path)
+            except Exception:
+                os.remove(temp_path)
+                raise
+        except OSError as e:
+            # Ohne Schreibrechte (z. B. gebündelte .exe) wird einfach ohne Cache gearbeitet
+            print(f"Vorschaubild konnte nicht gespeichert werden: {e}")
+            return
+
+        for stale_path in glob.glob(os.path.join(glob.escape(self.cache_dir), f"{stable}-*.png")):
+            if os.path.normcase(os.path.abspath(stale_path)) == os.path.normcase(os.path.abspath(cached_path)):
+                continue
+            try:
+                os.remove(stale_path)
+            except OSError:
+                # Bereits von einem anderen Thread entfernt oder noch in Benutzung (Windows)
+                pass
+
+
+# Gemeinsame Instanz für alle Vorschaubilder
+thumbnail_cache = ThumbnailCache()
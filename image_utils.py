@@ -1,8 +1,10 @@
 #image_utils.py:
 
-from PIL import Image, ImageTk
 import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from utils import load_image
+from image_cache import image_cache, thumbnail_cache
 
 def add_overlay(button, overlay_image):
     """
@@ -43,17 +45,101 @@ def combine_images(base_image_path, overlay_image_path, size):
     Returns:
         ImageTk.PhotoImage: Kombiniertes Bild.
     """
-    try:
-        # Öffne das Basis- und Overlay-Bild
-        base_image = Image.open(base_image_path).resize(size)
-        overlay_image = Image.open(overlay_image_path).resize(size)
+    key = image_cache.make_key(base_image_path, size, overlay_image_path)
+    cached = image_cache.get(key)
+    if cached is not None:
+        return cached
 
-        # Kombiniere die Bilder (unter Berücksichtigung der Transparenz)
-        combined_image = base_image.copy()
-        combined_image.paste(overlay_image, (0, 0), overlay_image)
+    from PIL import ImageTk  # erst bei Bedarf laden, hält den Programmstart kurz
+    try:
+        # Das kombinierte Bild kommt fertig aus dem Vorschau-Cache auf der Platte
+        combined_image = thumbnail_cache.load(base_image_path, size, overlay_image_path)
 
         # Konvertiere in ein tkinter-kompatibles Format
-        return ImageTk.PhotoImage(combined_image)
+        return image_cache.put(key, ImageTk.PhotoImage(combined_image))
     except Exception as e:
         print(f"Fehler beim Kombinieren der Bilder: {e}")
         return None
+
+
+class BackgroundImageLoader:
+    """
+    Dekodiert Bilder in einem Thread-Pool und reicht sie gebündelt an den Tk-Thread weiter.
+
+    Die Worker erzeugen nur PIL-Bilder (über den Vorschau-Cache). Erst der
+    Tk-Thread wandelt sie in ``ImageTk.PhotoImage`` um, legt sie im
+    ``image_cache`` ab und ruft den jeweiligen Rückruf auf. Dafür wird die
+    Warteschlange per ``root.after`` in kleinen Paketen geleert, damit die
+    Oberfläche zwischendurch bedienbar bleibt.
+    """
+
+    def __init__(self, root, max_workers=4, batch_size=16, interval_ms=15):
+        """
+        Args:
+            root (Tk): Hauptfenster, dessen Ereignisschleife die Ergebnisse verarbeitet.
+            max_workers (int): Anzahl der Dekodier-Threads.
+            batch_size (int): Maximale Anzahl Bilder pro Tk-Durchlauf.
+            interval_ms (int): Abstand zwischen zwei Durchläufen in Millisekunden.
+        """
+        self.root = root
+        self.batch_size = batch_size
+        self.interval_ms = interval_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-loader")
+        self.results = queue.Queue()
+        self.pending = 0
+        self.draining = False
+
+    def request(self, image_path, size, callback, overlay_path=None):
+        """
+        Fordert ein Bild an. Liegt es schon im ``image_cache``, wird ``callback``
+        sofort aufgerufen, sonst nach dem Dekodieren im Tk-Thread.
+
+        Args:
+            image_path (str): Pfad zum Bild.
+            size (tuple): Zielgröße (Breite, Höhe).
+            callback (callable): Erhält das fertige ``ImageTk.PhotoImage``.
+            overlay_path (str): Optionales Overlay, das über das Bild gelegt wird.
+        """
+        key = image_cache.make_key(image_path, size, overlay_path)
+        photo = image_cache.get(key)
+        if photo is not None:
+            callback(photo)
+            return
+
+        self.pending += 1
+        self.executor.submit(self._decode, key, image_path, size, overlay_path, callback)
+        if not self.draining:
+            self.draining = True
+            self.root.after(self.interval_ms, self._drain)
+
+    def _decode(self, key, image_path, size, overlay_path, callback):
+        # Läuft im Worker-Thread: nur PIL, kein Tk
+        try:
+            img = thumbnail_cache.load(image_path, size, overlay_path)
+        except Exception as e:
+            print(f"Fehler beim Laden des Bildes {image_path}: {e}")
+            img = None
+        self.results.put((key, img, callback))
+
+    def _drain(self):
+        from PIL import ImageTk
+        for _ in range(self.batch_size):
+            try:
+                key, img, callback = self.results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending -= 1
+            if img is None:
+                continue
+            photo = image_cache.get(key)
+            if photo is None:
+                photo = image_cache.put(key, ImageTk.PhotoImage(img))
+            callback(photo)
+
+        if self.pending > 0:
+            self.root.after(self.interval_ms, self._drain)
+        else:
+            self.draining = False
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
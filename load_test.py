@@ -0,0 +1,107 @@
+#load_test.py:
+
+"""
+Lasttest für ``solver_server.py``.
+
+Beispiel:
+    python solver_server.py --port 8765 &
+    python load_test.py --url http://127.0.0.1:8765 --requests 500 --concurrency 32
+
+Schickt zufällige Kader (ein Teil davon absichtlich identisch, um die
+Zusammenführung gleicher Anfragen zu prüfen) und gibt Durchsatz,
+Latenz-Perzentile und Statuscodes aus.
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import urllib.request
+import urllib.error
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from data_model import load_data_model
+
+
+def post(url, payload, timeout):
+    """
+    Schickt eine JSON-Anfrage.
+
+    Returns:
+        tuple: (HTTP-Status, Antwort als Dict, Dauer in Sekunden).
+    """
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode("utf-8"), headers={"Content-Type": "application/json"}
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            status, body = response.status, response.read()
+    except urllib.error.HTTPError as e:
+        status, body = e.code, e.read()
+    except OSError as e:
+        return 0, {"error": str(e)}, time.perf_counter() - start
+    return status, json.loads(body or b"{}"), time.perf_counter() - start
+
+
+def make_requests(names, count, duplicate_ratio, seed):
+    """
+    Erzeugt ``count`` Anfragen; ein Anteil ``duplicate_ratio`` wiederholt eine frühere.
+    """
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        if requests and rng.random() < duplicate_ratio:
+            requests.append(rng.choice(requests))
+            continue
+        owned = rng.sample(names, rng.randint(min(12, len(names)), len(names)))
+        endpoint = rng.choice(["/combination", "/combination", "/teams", "/activate"])
+        if endpoint == "/activate":
+            payload = {"characters": rng.sample(owned, min(6, len(owned)))}
+        else:
+            payload = {"owned": owned, "excluded": rng.sample(owned, 2)}
+            if endpoint == "/teams":
+                payload["teams"] = rng.randint(2, 6)
+        requests.append((endpoint, payload))
+    return requests
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lasttest für den lokalen Solver-Dienst.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--data", default="data.json", help="Pfad zu data.json (für die Charakternamen)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duplicates", type=float, default=0.3, help="Anteil wiederholter Anfragen")
+    parser.add_argument("--timeout", type=float, default=30, help="Client-Timeout in Sekunden")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    names = sorted(load_data_model(args.data).translations.characters("EN"))
+    requests = make_requests(names, args.requests, args.duplicates, args.seed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        results = list(executor.map(
+            lambda item: post(args.url + item[0], item[1], args.timeout), requests
+        ))
+    elapsed = time.perf_counter() - start
+
+    statuses = Counter(status for status, _, _ in results)
+    latencies = [duration for _, _, duration in results]
+    shared = sum(1 for _, body, _ in results if body.get("shared"))
+    print(f"{len(results)} Anfragen in {elapsed:.2f} s ({len(results) / elapsed:.1f}/s)")
+    print(f"Latenz p50 {percentile(latencies, 0.5) * 1000:.0f} ms, "
+          f"p95 {percentile(latencies, 0.95) * 1000:.0f} ms, max {max(latencies) * 1000:.0f} ms")
+    print(f"Status: {dict(sorted(statuses.items()))}, geteilte Ergebnisse: {shared}")
+    return 0 if set(statuses) <= {200} else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
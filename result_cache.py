@@ -0,0 +1,168 @@
+#result_cache.py:
+
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Datei für gespeicherte Autofill-Ergebnisse
+RESULT_CACHE_FILE = "solver_cache.json"
+
+# Höchstzahl gespeicherter Ergebnisse
+DEFAULT_MAX_ENTRIES = 128
+
+
+def data_fingerprint(data):
+    """
+    Prüfsumme über den Inhalt der Kartendaten; ändert sich ``data.json``, ändert sie sich mit.
+    """
+    encoded = json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class ResultCache:
+    """
+    Zwischenspeicher für Solver-Ergebnisse mit LRU-Verdrängung und optionaler Datei.
+
+    Schlüssel und Ergebnisse verwenden kanonische Charakter-IDs und die
+    Kartenschlüssel aus ``data.json``, sind also sprachunabhängig. Die Datei
+    trägt die Prüfsumme der Kartendaten; passt sie nicht mehr, wird der
+    gesamte Inhalt verworfen. Zugriffe sind per Lock geschützt, weil Ergebnisse
+    aus dem Berechnungs-Thread eingetragen werden.
+    """
+
+    def __init__(self, path=RESULT_CACHE_FILE, max_entries=DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            path (str): Datei für die Ergebnisse oder None für einen reinen Speicher-Cache.
+            max_entries (int): Höchstzahl der Einträge.
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.data_hash = None
+        self.translations = None
+        self.lock = threading.Lock()
+
+    def bind(self, data, translations):
+        """
+        Verknüpft den Cache mit den Kartendaten und lädt passende gespeicherte Ergebnisse.
+
+        Args:
+            data (dict): Die Kartendaten.
+            translations (TranslationTable): Übersetzungstabelle zu ``data``.
+        """
+        data_hash = data_fingerprint(data)
+        with self.lock:
+            if data_hash != self.data_hash:
+                self.entries.clear()
+            self.data_hash = data_hash
+            self.translations = translations
+            self.load()
+
+    def make_key(self, kind, language, available, preselected, valid_cards, **params):
+        """
+        Kanonischer Fingerabdruck einer Anfrage.
+
+        Args:
+            kind (str): Art der Berechnung, z. B. "combination" oder "teams".
+            language (str): Sprache der übergebenen Namen.
+            available (iterable): Verfügbare Charaktere.
+            preselected (iterable): Bereits ausgewählte Charaktere.
+            valid_cards (dict): Gefilterte Karten; nur ihre Schlüssel zählen.
+            **params: Weitere Parameter, die das Ergebnis beeinflussen.
+
+        Returns:
+            str: Hexadezimaler Schlüssel.
+        """
+        request = {
+            "data": self.data_hash,
+            "kind": kind,
+            "available": sorted(self._canonical(name, language) for name in available),
+            "preselected": sorted(self._canonical(name, language) for name in preselected),
+            "cards": sorted(valid_cards),
+            "params": params,
+        }
+        encoded = json.dumps(request, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key, language):
+        """
+        Liefert das gespeicherte Ergebnis in der angegebenen Sprache oder None.
+        """
+        with self.lock:
+            result = self.entries.get(key)
+            if result is None:
+                return None
+            self.entries.move_to_end(key)
+        return self._localize(result, language)
+
+    def put(self, key, language, result):
+        """
+        Speichert ein vollständig berechnetes Ergebnis und schreibt die Datei.
+        """
+        canonical = self._localize(result, language, to_canonical=True)
+        with self.lock:
+            self.entries[key] = canonical
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+            self.save()
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.save()
+
+    def load(self):
+        """
+        Lädt die Datei, sofern sie zu den aktuellen Kartendaten gehört.
+        """
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                stored = json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"Ergebnis-Cache {self.path} konnte nicht gelesen werden: {e}")
+            return
+        if stored.get("data_hash") != self.data_hash:
+            # Kartendaten haben sich geändert: alte Ergebnisse sind ungültig
+            return
+        for key, result in stored.get("entries", []):
+            self.entries[key] = result
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def save(self):
+        """
+        Schreibt alle Einträge atomar in die Datei.
+        """
+        if not self.path:
+            return
+        stored = {"data_hash": self.data_hash, "entries": list(self.entries.items())}
+        temp_path = f"{self.path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(stored, file, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            # Ohne Schreibrechte bleibt der Cache im Speicher wirksam
+            print(f"Ergebnis-Cache konnte nicht gespeichert werden: {e}")
+
+    def _canonical(self, name, language):
+        canonical_id = self.translations.canonical_id(name, language)
+        return name if canonical_id is None else canonical_id
+
+    def _localize(self, result, language, to_canonical=False):
+        # Ergebnisse sind Namenslisten oder Listen von Namenslisten (Teams)
+        if isinstance(result, str):
+            if to_canonical:
+                return self._canonical(result, language)
+            return self.translations.localize(result, language)
+        return [self._localize(item, language, to_canonical) for item in result]
+
+
+# Gemeinsame Instanz für Autofill und "Fill All"
+result_cache = ResultCache()
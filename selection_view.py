@@ -0,0 +1,166 @@
+#selection_view.py:
+
+import os
+from tkinter import Button, Frame, Label
+from utils import load_image
+from image_cache import image_cache
+
+
+class SlotPool:
+    """
+    Wiederverwendbare Widgets für eine Reihe gleichartiger Anzeigeplätze.
+
+    Jeder Platz merkt sich, welchen Inhalt er gerade zeigt. ``show`` gleicht die
+    gewünschten Inhalte damit ab und konfiguriert nur Plätze, die sich ändern;
+    überzählige Plätze werden per ``grid_remove`` versteckt statt zerstört.
+    """
+
+    def __init__(self, create_slot, update_slot, place_slot):
+        """
+        Args:
+            create_slot (callable): Erzeugt einen neuen Platz.
+            update_slot (callable): Zeigt einen Inhalt auf einem Platz an: (Platz, Inhalt).
+            place_slot (callable): Ordnet einen Platz im Layout an: (Platz, Index).
+        """
+        self.create_slot = create_slot
+        self.update_slot = update_slot
+        self.place_slot = place_slot
+        self.slots = []
+        self.shown = []
+
+    def reserve(self, count):
+        """
+        Erzeugt Plätze, bis mindestens ``count`` vorhanden sind; neue Plätze bleiben leer.
+        """
+        while len(self.slots) < count:
+            self.slots.append(self.create_slot())
+            self.shown.append(None)
+
+    def show(self, contents):
+        """
+        Zeigt ``contents`` an und ändert dabei nur abweichende Plätze.
+        """
+        self.reserve(len(contents))
+
+        for index, slot in enumerate(self.slots):
+            content = contents[index] if index < len(contents) else None
+            if content == self.shown[index]:
+                continue
+            if content is None:
+                slot.grid_remove()
+            else:
+                self.update_slot(slot, content)
+                if self.shown[index] is None:
+                    self.place_slot(slot, index)
+            self.shown[index] = content
+
+
+class SelectionView:
+    """
+    Retained-Mode-Anzeige der ausgewählten Charaktere, aktivierten Karten und Vorschläge.
+
+    Statt bei jedem Klick alle Widgets zu zerstören und neu zu erzeugen, hält
+    die Ansicht feste Pools an Plätzen und konfiguriert nur geänderte Plätze um.
+    """
+
+    def __init__(self, selected_frame, cards_frame, suggestions_frame, img_dir, buffs_dir, on_select):
+        """
+        Args:
+            selected_frame (Frame): Rahmen für die sechs Auswahlplätze.
+            cards_frame (Frame): Rahmen für die aktivierten Karten.
+            suggestions_frame (Frame): Rahmen für die Vorschlags-Buttons.
+            img_dir (str): Verzeichnis der Charakterbilder.
+            buffs_dir (str): Verzeichnis der Buff-Bilder.
+            on_select (callable): Wird mit dem Charakternamen aufgerufen, wenn ein Platz angeklickt wird.
+        """
+        self.selected_frame = selected_frame
+        self.cards_frame = cards_frame
+        self.suggestions_frame = suggestions_frame
+        self.img_dir = img_dir
+        self.buffs_dir = buffs_dir
+        self.on_select = on_select
+
+        self.selection_slots = SlotPool(self._create_character_slot, self._update_character_slot,
+                                        lambda slot, index: slot.grid(row=index // 3, column=index % 3, padx=5, pady=5))
+        self.card_slots = SlotPool(self._create_card_slot, self._update_card_slot,
+                                   lambda slot, index: slot.grid(row=0, column=index, padx=5, pady=5))
+        self.suggestion_slots = SlotPool(self._create_suggestion_slot, self._update_suggestion_slot,
+                                         lambda slot, index: slot.grid(row=0, column=index, padx=5, pady=2))
+
+        # Sechs Auswahlplätze von Anfang an bereithalten
+        self.selection_slots.reserve(6)
+
+    def show_selection(self, characters):
+        """
+        Args:
+            characters (list): Tupel aus (Anzeigename, Bildname) der ausgewählten Charaktere.
+        """
+        self.selection_slots.show(list(characters))
+
+    def show_cards(self, cards, language):
+        """
+        Args:
+            cards (list): Aktivierte Karten im Format von ``activate_cards``.
+            language (str): Sprache für Name und Typ.
+        """
+        self.card_slots.show([
+            (card["name"]["DE"], f"{card['name'][language]} ({card['type'][language]})") for card in cards
+        ])
+
+    def show_suggestions(self, suggestions):
+        """
+        Args:
+            suggestions (list): Tupel aus (Charakter, aktivierte Karten, danach einen entfernt).
+        """
+        self.suggestion_slots.show(list(suggestions))
+
+    def _create_character_slot(self):
+        button = Button(self.selected_frame, compound="top")
+        button.character = None
+        button.configure(command=lambda: self.on_select(button.character))
+        return button
+
+    def _update_character_slot(self, button, content):
+        name, image_name = content
+        button.character = name
+        try:
+            photo = load_image(os.path.join(self.img_dir, f"{image_name}.jpg"), (80, 80))
+            button.configure(image=photo, text=name)
+            button.image = photo
+        except Exception as e:
+            button.configure(image="", text=name)
+            print(f"Fehler beim Anzeigen des Bildes für {name}: {e}")
+
+    def _create_card_slot(self):
+        frame = Frame(self.cards_frame)
+        frame.img_label = Label(frame)
+        frame.text_label = Label(frame)
+        frame.text_label.pack(side="bottom")
+        return frame
+
+    def _update_card_slot(self, frame, content):
+        image_name, text = content
+        buff_image_path = os.path.join(self.buffs_dir, f"{image_name}.jpg")  # Bild immer auf DE basieren
+        frame.text_label.configure(text=text)
+        try:
+            if image_cache.exists(buff_image_path):
+                buff_photo = load_image(buff_image_path, (50, 50))
+                frame.img_label.configure(image=buff_photo)
+                frame.img_label.image = buff_photo
+                frame.img_label.pack(side="top")
+            else:
+                frame.img_label.pack_forget()
+        except Exception as e:
+            frame.img_label.pack_forget()
+            print(f"Fehler beim Anzeigen des Buff-Bildes für {image_name}: {e}")
+
+    def _create_suggestion_slot(self):
+        button = Button(self.suggestions_frame)
+        button.character = None
+        button.configure(command=lambda: self.on_select(button.character))
+        return button
+
+    def _update_suggestion_slot(self, button, content):
+        name, completes, closer = content
+        button.character = name
+        button.configure(text=f"{name} (+{completes} / {closer})")
@@ -0,0 +1,257 @@
+#solver_server.py:
+
+"""
+Lokaler HTTP-Dienst für den Combo-Solver, z. B. für einen Gilden-Bot.
+
+Start:
+    python solver_server.py --port 8765 --workers 4
+
+Endpunkte (JSON, Felder wie in ``batch_solver``):
+    GET  /health       Status und Anzahl laufender Berechnungen
+    POST /activate     {"characters": [...], "language": "EN", "type": null}
+    POST /combination  {"owned": [...], "excluded": [...], "preselected": [...], "type": null, "timeout": 10}
+    POST /teams        wie /combination, zusätzlich "teams": 1 bis 6
+
+Anfragen werden parallel in Threads angenommen; die Suchen laufen in einem
+begrenzten Prozess-Pool. Gleiche Anfragen, die gleichzeitig eintreffen, teilen
+sich eine Berechnung.
+"""
+
+import sys
+import json
+import math
+import argparse
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from character_utils import activate_cards, default_worker_count
+from data_model import load_data_model
+from batch_solver import solve_roster, resolve_card_type, init_worker
+
+# Standard- und Höchstwert für das Zeitbudget einer Suche in Sekunden
+DEFAULT_TIMEOUT = 10
+MAX_TIMEOUT = 60
+
+# Zusätzliche Wartezeit auf das Ergebnis, nachdem das Zeitbudget abgelaufen ist
+RESPONSE_GRACE = 5
+
+# Höchstzahl der Teams für /teams
+MAX_TEAMS = 6
+
+# Obergrenze für die Größe eines Request-Bodys in Bytes
+MAX_BODY_BYTES = 64 * 1024
+
+
+class SolverService:
+    """
+    Gemeinsamer Zustand des Servers: Datenmodell, Prozess-Pool und laufende Berechnungen.
+    """
+
+    def __init__(self, data_file, workers, max_pending):
+        """
+        Args:
+            data_file (str): Pfad zu data.json.
+            workers (int): Anzahl der Such-Prozesse.
+            max_pending (int): Höchstzahl gleichzeitig laufender oder wartender Suchen.
+        """
+        self.data_model = load_data_model(data_file)
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(data_file,))
+        self.max_pending = max_pending
+        self.in_flight = {}
+        self.lock = threading.Lock()
+
+    def activate(self, body):
+        """
+        Aktivierte Karten einer Charakterliste; läuft direkt im Request-Thread.
+        """
+        language = self.language_of(body)
+        characters = self.names_of(body, "characters")
+        card_type = resolve_card_type(self.data_model, body.get("type"))
+        cards = activate_cards(self.data_model.cards_of_type(card_type), characters, language)
+        return 200, {"cards": [{"name": card["name"][language], "type": card["type"][language]} for card in cards]}
+
+    def combination(self, body):
+        return self.solve(body, team_count=1)
+
+    def teams(self, body):
+        team_count = body.get("teams", MAX_TEAMS)
+        if not isinstance(team_count, int) or isinstance(team_count, bool) or not 1 <= team_count <= MAX_TEAMS:
+            raise ValueError(f"teams muss eine ganze Zahl von 1 bis {MAX_TEAMS} sein")
+        return self.solve(body, team_count=team_count)
+
+    def language_of(self, body):
+        """
+        Sprache einer Anfrage; nur Sprachen, die in den Kartendaten vorkommen.
+
+        Raises:
+            ValueError: Bei einer unbekannten Sprache.
+        """
+        language = body.get("language", "EN")
+        if language not in self.data_model.translations.names_by_language:
+            known = ", ".join(sorted(self.data_model.translations.names_by_language))
+            raise ValueError(f"Unbekannte Sprache {language!r}, erlaubt: {known}")
+        return language
+
+    @staticmethod
+    def names_of(body, key):
+        """
+        Namensliste ``key`` einer Anfrage, ohne Doppelte und sortiert; fehlt sie, ist sie leer.
+
+        Raises:
+            ValueError: Wenn der Wert keine Liste von Strings ist.
+        """
+        names = body.get(key, [])
+        if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+            raise ValueError(f"{key} muss eine Liste von Namen sein")
+        return sorted(set(names))
+
+    def solve(self, body, team_count):
+        """
+        Führt eine Suche im Prozess-Pool aus oder schließt sich einer gleichen laufenden an.
+
+        Returns:
+            tuple: (HTTP-Status, Antwort als Dict).
+
+        Raises:
+            ValueError: Bei Namenslisten, die keine Listen von Strings sind, einer
+                unbekannten Sprache oder einem ungültigen ``timeout``.
+        """
+        roster = {key: body[key] for key in ("owned", "excluded", "preselected", "type") if key in body}
+        roster["language"] = self.language_of(body)
+        for key in ("owned", "excluded", "preselected"):
+            if key in roster:
+                roster[key] = self.names_of(body, key)
+        roster["teams"] = team_count
+        try:
+            timeout = float(body.get("timeout", DEFAULT_TIMEOUT))
+        except (TypeError, ValueError):
+            raise ValueError("timeout muss eine Zahl sein") from None
+        if not math.isfinite(timeout):
+            raise ValueError("timeout muss eine endliche Zahl sein")
+        timeout = min(timeout, MAX_TIMEOUT)
+        if timeout <= 0:
+            timeout = DEFAULT_TIMEOUT
+        defaults = {"language": "EN", "type": None, "teams": team_count, "time_limit": timeout}
+
+        key = json.dumps([roster, timeout], sort_keys=True, ensure_ascii=False)
+        with self.lock:
+            future = self.in_flight.get(key)
+            shared = future is not None
+            if future is None:
+                if len(self.in_flight) >= self.max_pending:
+                    return 503, {"error": "Zu viele gleichzeitige Berechnungen, bitte später erneut versuchen."}
+                future = self.executor.submit(solve_roster, roster, defaults)
+                self.in_flight[key] = future
+        if not shared:
+            # Außerhalb des Locks, da der Callback bei fertigen Futures sofort läuft
+            future.add_done_callback(lambda done, key=key: self._finish(key, done))
+
+        try:
+            result = future.result(timeout=timeout + RESPONSE_GRACE)
+        except FutureTimeoutError:
+            return 504, {"error": f"Keine Antwort innerhalb von {timeout + RESPONSE_GRACE:.0f} Sekunden."}
+
+        result = {key: value for key, value in result.items() if key != "player"}
+        result["shared"] = shared
+        return (400 if "error" in result else 200), result
+
+    def _finish(self, key, future):
+        with self.lock:
+            if self.in_flight.get(key) is future:
+                del self.in_flight[key]
+
+    def status(self):
+        with self.lock:
+            in_flight = len(self.in_flight)
+        return 200, {"status": "ok", "in_flight": in_flight, "cards": len(self.data_model.card_keys)}
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class SolverRequestHandler(BaseHTTPRequestHandler):
+    """
+    Verteilt JSON-Anfragen auf die Methoden von ``SolverService``.
+    """
+
+    server_version = "TitanWarSolver/1.0"
+    routes = {"/activate": "activate", "/combination": "combination", "/teams": "teams"}
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(*self.server.service.status())
+        else:
+            self._send_json(404, {"error": f"Unbekannter Pfad: {self.path}"})
+
+    def do_POST(self):
+        method = self.routes.get(self.path)
+        if method is None:
+            self._send_json(404, {"error": f"Unbekannter Pfad: {self.path}"})
+            return
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            self._send_json(413, {"error": "Anfrage zu groß."})
+            return
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(body, dict):
+                raise ValueError("JSON-Objekt erwartet")
+            status, payload = getattr(self.server.service, method)(body)
+        except ValueError as e:
+            status, payload = 400, {"error": str(e)}
+        except Exception as e:
+            status, payload = 500, {"error": str(e)}
+        self._send_json(status, payload)
+
+    def _send_json(self, status, payload):
+        encoded = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def create_server(host, port, service, verbose=False):
+    """
+    Erzeugt den HTTP-Server; jede Verbindung läuft in einem eigenen Thread.
+    """
+    server = ThreadingHTTPServer((host, port), SolverRequestHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.verbose = verbose
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lokaler HTTP-Dienst für den Combo-Solver.")
+    parser.add_argument("--host", default="127.0.0.1", help="Adresse (Standard: nur lokal)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--data", default="data.json", help="Pfad zu data.json")
+    parser.add_argument("--workers", type=int, default=default_worker_count(), help="Anzahl der Such-Prozesse")
+    parser.add_argument("--max-pending", type=int, default=64, help="Höchstzahl gleichzeitiger Suchen")
+    parser.add_argument("--verbose", action="store_true", help="Jede Anfrage protokollieren")
+    args = parser.parse_args(argv)
+
+    service = SolverService(args.data, max(1, args.workers), args.max_pending)
+    server = create_server(args.host, args.port, service, args.verbose)
+    print(f"Solver-Dienst läuft auf http://{args.host}:{server.server_port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,190 @@
+#startup_benchmark.py:
+
+"""
+Misst die Startzeit der GUI und prüft sie gegen ein Budget.
+
+Beispiel:
+    python startup_benchmark.py --runs 5 --frame-budget-ms 1000
+
+1. Import: ``python -X importtime`` für ``TitanWar_Combo_Helper``; die Dauer
+   und die teuersten Module werden ausgegeben. Zusätzlich wird geprüft, dass
+   PIL, zipfile und urllib.request beim Import noch nicht geladen werden.
+2. Erstes Fenster: Das Programm wird mit ``TWCH_STARTUP_PROBE=1`` gestartet,
+   meldet das erste gezeichnete Fenster und das Ende des Datenladens und
+   beendet sich. Downloads sind dabei abgeschaltet (``TWCH_NO_UPDATE=1``).
+   Gemessen wird ab dem Prozessstart. Ohne Display wird dieser Teil
+   übersprungen.
+
+Liegt der Median über einem Budget, endet das Skript mit Status 1.
+"""
+
+import os
+import sys
+import json
+import time
+import queue
+import argparse
+import statistics
+import threading
+import subprocess
+
+APP_MODULE = "TitanWar_Combo_Helper"
+PROBE_ENV = "TWCH_STARTUP_PROBE"
+
+# Schaltet im Messlauf alle Downloads ab, damit das Netzwerk nicht mitgemessen wird
+NO_UPDATE_ENV = "TWCH_NO_UPDATE"
+
+# Module, die erst bei Bedarf geladen werden sollen
+DEFERRED_MODULES = ["PIL", "zipfile", "urllib.request"]
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def measure_import():
+    """
+    Importdauer des Hauptmoduls laut ``-X importtime``.
+
+    Returns:
+        tuple: (Dauer in ms, Liste der teuersten Module als (Name, ms)).
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {APP_MODULE}"],
+        cwd=APP_DIR, capture_output=True, text=True, check=True,
+    )
+    modules = []
+    total_ms = None
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        modules.append((name, int(cumulative) / 1000))
+        if name == APP_MODULE:
+            total_ms = int(cumulative) / 1000
+    top = sorted(((name, ms) for name, ms in modules if name != APP_MODULE), key=lambda item: -item[1])[:10]
+    return total_ms, top
+
+
+def deferred_modules_loaded():
+    """
+    Module aus ``DEFERRED_MODULES``, die schon beim Import des Hauptmoduls geladen werden.
+    """
+    code = f"import sys, json, {APP_MODULE}; print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))"
+    completed = subprocess.run([sys.executable, "-c", code], cwd=APP_DIR, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def measure_first_frame(timeout):
+    """
+    Startet die GUI im Messmodus.
+
+    Ausgaben werden von Threads in eine Queue gelesen, damit ein Prozess, der
+    hängt, ohne etwas auszugeben, spätestens nach ``timeout`` Sekunden beendet wird.
+
+    Returns:
+        dict | None: Millisekunden bis "first_frame" und "ready" oder None ohne Display.
+    """
+    env = dict(os.environ, **{PROBE_ENV: "1", NO_UPDATE_ENV: "1"})
+    start = time.perf_counter()
+    deadline = start + timeout
+    process = subprocess.Popen(
+        [sys.executable, f"{APP_MODULE}.py"], cwd=APP_DIR, env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+    )
+    lines = queue.Queue()
+    errors = []
+
+    def pump(stream, name):
+        for line in stream:
+            lines.put((name, line.strip()))
+        lines.put((name, None))
+
+    readers = [
+        threading.Thread(target=pump, args=(process.stdout, "stdout"), daemon=True),
+        threading.Thread(target=pump, args=(process.stderr, "stderr"), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    timings = {}
+    try:
+        while True:
+            try:
+                name, line = lines.get(timeout=max(0.0, deadline - time.perf_counter()))
+            except queue.Empty:
+                break
+            if name == "stderr":
+                if line:
+                    errors.append(line)
+                continue
+            if line is None:
+                break
+            if line == "STARTUP_FIRST_FRAME":
+                timings["first_frame"] = (time.perf_counter() - start) * 1000
+            elif line == "STARTUP_READY":
+                timings["ready"] = (time.perf_counter() - start) * 1000
+                break
+    finally:
+        try:
+            process.wait(timeout=max(1.0, deadline - time.perf_counter()))
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        for reader in readers:
+            reader.join(timeout=1.0)
+    if "first_frame" not in timings:
+        print(f"Kein Fenster gemessen ({errors[-1] if errors else 'ohne Ausgabe'})", file=sys.stderr)
+        return None
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Startzeit der GUI mit Budget.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=400)
+    parser.add_argument("--frame-budget-ms", type=float, default=1000)
+    parser.add_argument("--timeout", type=float, default=60, help="Abbruch eines Messlaufs in Sekunden")
+    parser.add_argument("--output", "-o", help="Ergebnisse als JSON speichern")
+    args = parser.parse_args(argv)
+
+    failures = []
+    report = {}
+
+    import_times = []
+    for _ in range(args.runs):
+        total_ms, top = measure_import()
+        import_times.append(total_ms)
+    report["import_ms"] = statistics.median(import_times)
+    report["slowest_imports"] = top
+    print(f"Import {APP_MODULE}: {report['import_ms']:.0f} ms (Median aus {args.runs})")
+    for name, ms in top:
+        print(f"  {ms:8.1f} ms  {name}")
+    if report["import_ms"] > args.import_budget_ms:
+        failures.append(f"Import {report['import_ms']:.0f} ms > {args.import_budget_ms:.0f} ms")
+
+    report["deferred_loaded"] = deferred_modules_loaded()
+    if report["deferred_loaded"]:
+        failures.append(f"Beim Import bereits geladen: {', '.join(report['deferred_loaded'])}")
+
+    runs = [timings for timings in (measure_first_frame(args.timeout) for _ in range(args.runs)) if timings]
+    if runs:
+        report["first_frame_ms"] = statistics.median(run["first_frame"] for run in runs)
+        ready = [run["ready"] for run in runs if "ready" in run]
+        report["ready_ms"] = statistics.median(ready) if ready else None
+        print(f"Erstes Fenster: {report['first_frame_ms']:.0f} ms, Daten geladen: "
+              f"{report['ready_ms']:.0f} ms" if ready else f"Erstes Fenster: {report['first_frame_ms']:.0f} ms")
+        if report["first_frame_ms"] > args.frame_budget_ms:
+            failures.append(f"Erstes Fenster {report['first_frame_ms']:.0f} ms > {args.frame_budget_ms:.0f} ms")
+    else:
+        print("Messung des ersten Fensters übersprungen (kein Display?)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    for failure in failures:
+        print(f"Budget überschritten: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
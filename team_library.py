@@ -0,0 +1,277 @@
+#team_library.py:
+
+"""
+Teambibliothek in einer SQLite-Datenbank.
+
+Beispiel:
+    python team_library.py --card "Deadly Pursuit" --language EN
+    python team_library.py --character Larissa --character Anakin --language EN
+
+Teams werden mit kanonischen Charakter-IDs gespeichert. Beim Speichern werden
+die aktivierten Karten einmal mit ``activate_cards`` berechnet und mit
+abgelegt; Mitglieder und Karten sind indiziert, sodass die Suche nach Teams
+mit einer bestimmten Karte oder bestimmten Charakteren ohne Neuberechnung
+auskommt. Ändern sich die Kartendaten, werden die Karten aller Teams beim
+nächsten ``bind`` neu berechnet.
+"""
+
+import sys
+import time
+import sqlite3
+import argparse
+from character_utils import activate_cards
+from data_model import CANONICAL_LANGUAGE, get_data_model, load_data_model
+from result_cache import data_fingerprint
+
+# Datei der Teambibliothek
+TEAM_LIBRARY_FILE = "teams.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS teams (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    updated REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS team_members (
+    team_id INTEGER NOT NULL REFERENCES teams(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    character TEXT NOT NULL,
+    PRIMARY KEY (team_id, position)
+);
+CREATE INDEX IF NOT EXISTS team_members_character ON team_members(character, team_id);
+CREATE TABLE IF NOT EXISTS team_cards (
+    team_id INTEGER NOT NULL REFERENCES teams(id) ON DELETE CASCADE,
+    card TEXT NOT NULL,
+    PRIMARY KEY (team_id, card)
+);
+CREATE INDEX IF NOT EXISTS team_cards_card ON team_cards(card, team_id);
+"""
+
+
+class TeamLibrary:
+    """
+    Gespeicherte Teams mit Index auf Mitglieder und aktivierte Karten.
+
+    Namen werden an der Schnittstelle in der jeweils angegebenen Sprache
+    übergeben und zurückgegeben, gespeichert werden kanonische IDs und
+    Kartenschlüssel aus ``data.json``. Vor dem Speichern oder Suchen muss
+    ``bind`` mit den Kartendaten aufgerufen werden.
+    """
+
+    def __init__(self, path=TEAM_LIBRARY_FILE):
+        """
+        Args:
+            path (str): Datei der Datenbank oder ":memory:".
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(SCHEMA)
+        self.data = None
+        self.translations = None
+        self.card_keys = {}
+
+    def bind(self, data):
+        """
+        Verknüpft die Bibliothek mit den Kartendaten und berechnet die Karten aller
+        Teams neu, falls sich die Daten seit dem letzten Aufruf geändert haben.
+        """
+        self.data = data
+        self.translations = get_data_model(data).translations
+
+        # Karten lassen sich über Schlüssel oder Namen in jeder Sprache suchen
+        self.card_keys = {card_info["name"][CANONICAL_LANGUAGE]: card_key for card_key, card_info in data.items()}
+        for card_key, card_info in data.items():
+            for name in card_info["name"].values():
+                self.card_keys.setdefault(name, card_key)
+            self.card_keys.setdefault(card_key, card_key)
+
+        data_hash = data_fingerprint(data)
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'data_hash'").fetchone()
+        if row is None or row[0] != data_hash:
+            self._refresh_cards()
+            with self.connection:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('data_hash', ?)", (data_hash,)
+                )
+
+    def activated_card_keys(self, canonical_ids):
+        """
+        Schlüssel der Karten, die ein Team aus kanonischen IDs aktiviert.
+        """
+        return [
+            self.card_keys[card["name"][CANONICAL_LANGUAGE]]
+            for card in activate_cards(self.data, canonical_ids, CANONICAL_LANGUAGE)
+        ]
+
+    def save_team(self, team_name, characters, language):
+        """
+        Speichert ein Team; ein vorhandenes Team gleichen Namens wird ersetzt.
+        """
+        self.save_teams({team_name: characters}, language)
+
+    def save_teams(self, teams, language):
+        """
+        Speichert mehrere Teams in einer Transaktion.
+
+        Args:
+            teams (dict): Teamname -> Charakternamen.
+            language (str): Sprache der Charakternamen.
+        """
+        now = time.time()
+        with self.connection:
+            for team_name, characters in teams.items():
+                canonical_ids = [self._canonical(name, language) for name in characters]
+                self.connection.execute(
+                    "INSERT INTO teams (name, updated) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET updated = excluded.updated",
+                    (team_name, now),
+                )
+                team_id = self.connection.execute("SELECT id FROM teams WHERE name = ?", (team_name,)).fetchone()[0]
+                self._store(team_id, canonical_ids)
+
+    def load_team(self, team_name, language):
+        """
+        Mitglieder eines Teams in der angegebenen Sprache; unbekannte Teams sind leer.
+        """
+        return self.load_teams([team_name], language).get(team_name, [])
+
+    def load_teams(self, team_names, language):
+        """
+        Mitglieder mehrerer Teams in der angegebenen Sprache.
+
+        Returns:
+            dict: Teamname -> Charakternamen, nur für gespeicherte Teams.
+        """
+        team_names = list(team_names)
+        if not team_names:
+            return {}
+        placeholders = ", ".join("?" * len(team_names))
+        rows = self.connection.execute(
+            f"SELECT t.name, m.character FROM teams t LEFT JOIN team_members m ON m.team_id = t.id "
+            f"WHERE t.name IN ({placeholders}) ORDER BY t.name, m.position",
+            team_names,
+        )
+        return self._group(rows, language)
+
+    def delete_teams(self, team_names):
+        """
+        Entfernt Teams samt Mitgliedern und Karten.
+        """
+        with self.connection:
+            self.connection.executemany("DELETE FROM teams WHERE name = ?", [(name,) for name in team_names])
+
+    def team_names(self):
+        """
+        Namen aller gespeicherten Teams, alphabetisch.
+        """
+        return [name for name, in self.connection.execute("SELECT name FROM teams ORDER BY name")]
+
+    def find_teams(self, language, card=None, characters=()):
+        """
+        Sucht Teams, die eine Karte aktivieren und/oder alle angegebenen Charaktere enthalten.
+
+        Args:
+            language (str): Sprache der Charakternamen in Anfrage und Ergebnis.
+            card (str): Kartenschlüssel oder Kartenname in beliebiger Sprache.
+            characters (list): Charaktere, die alle im Team sein müssen.
+
+        Returns:
+            dict: Teamname -> Charakternamen, alphabetisch nach Teamname.
+        """
+        query = "SELECT DISTINCT t.id, t.name FROM teams t"
+        params = []
+        if card is not None:
+            query += " JOIN team_cards c ON c.team_id = t.id AND c.card = ?"
+            params.append(self.card_keys.get(card, card))
+        for index, name in enumerate(dict.fromkeys(characters)):
+            query += f" JOIN team_members m{index} ON m{index}.team_id = t.id AND m{index}.character = ?"
+            params.append(self._canonical(name, language))
+
+        rows = self.connection.execute(
+            f"SELECT t.name, m.character FROM ({query}) t JOIN team_members m ON m.team_id = t.id "
+            f"ORDER BY t.name, m.position",
+            params,
+        )
+        return self._group(rows, language)
+
+    def team_cards(self, team_name, language):
+        """
+        Namen der gespeicherten aktivierten Karten eines Teams in der angegebenen Sprache.
+        """
+        rows = self.connection.execute(
+            "SELECT c.card FROM team_cards c JOIN teams t ON t.id = c.team_id WHERE t.name = ? ORDER BY c.card",
+            (team_name,),
+        )
+        return [self.data[card_key]["name"].get(language, card_key) if card_key in self.data else card_key
+                for card_key, in rows]
+
+    def close(self):
+        self.connection.close()
+
+    def _canonical(self, name, language):
+        canonical_id = self.translations.canonical_id(name, language) if self.translations else None
+        return canonical_id if canonical_id is not None else name
+
+    def _group(self, rows, language):
+        teams = {}
+        for team_name, canonical_id in rows:
+            members = teams.setdefault(team_name, [])
+            if canonical_id is not None:
+                members.append(self.translations.localize(canonical_id, language) if self.translations else canonical_id)
+        return teams
+
+    def _store(self, team_id, canonical_ids):
+        # Mitglieder und Karten eines Teams vollständig ersetzen; läuft in der Transaktion des Aufrufers
+        self.connection.execute("DELETE FROM team_members WHERE team_id = ?", (team_id,))
+        self.connection.execute("DELETE FROM team_cards WHERE team_id = ?", (team_id,))
+        self.connection.executemany(
+            "INSERT INTO team_members (team_id, position, character) VALUES (?, ?, ?)",
+            [(team_id, position, canonical_id) for position, canonical_id in enumerate(canonical_ids)],
+        )
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO team_cards (team_id, card) VALUES (?, ?)",
+            [(team_id, card_key) for card_key in self.activated_card_keys(canonical_ids)],
+        )
+
+    def _refresh_cards(self):
+        members = {}
+        for team_id, canonical_id in self.connection.execute(
+            "SELECT t.id, m.character FROM teams t LEFT JOIN team_members m ON m.team_id = t.id ORDER BY t.id, m.position"
+        ):
+            team = members.setdefault(team_id, [])
+            if canonical_id is not None:
+                team.append(canonical_id)
+        with self.connection:
+            for team_id, canonical_ids in members.items():
+                self._store(team_id, canonical_ids)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gespeicherte Teams durchsuchen.")
+    parser.add_argument("--library", default=TEAM_LIBRARY_FILE, help="Datei der Teambibliothek")
+    parser.add_argument("--data", default="data.json", help="Pfad zu data.json")
+    parser.add_argument("--language", default="EN", help="Sprache der Namen in Anfrage und Ausgabe")
+    parser.add_argument("--card", help="Nur Teams, die diese Karte aktivieren")
+    parser.add_argument("--character", action="append", default=[], help="Nur Teams mit diesem Charakter (mehrfach möglich)")
+    args = parser.parse_args(argv)
+
+    library = TeamLibrary(args.library)
+    try:
+        library.bind(load_data_model(args.data).data)
+        teams = library.find_teams(args.language, card=args.card, characters=args.character)
+        for team_name, characters in teams.items():
+            cards = library.team_cards(team_name, args.language)
+            print(f"{team_name}: {', '.join(characters)}  [{len(cards)} Karten: {', '.join(cards)}]")
+        print(f"{len(teams)} Teams gefunden", file=sys.stderr)
+    finally:
+        library.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
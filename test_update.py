@@ -0,0 +1,235 @@
+#test_update.py:
+
+"""
+Tests für update.py gegen einen lokalen ``http.server`` in einem Thread.
+
+Start:
+    python -m unittest test_update
+"""
+
+import os
+import json
+import shutil
+import tempfile
+import threading
+import zipfile
+import unittest
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from update import AssetUpdater, build_manifest, download_file, file_sha256, stale_manifest_entries
+
+# Verzeichnis des Repositorys mit dem veröffentlichten manifest.json
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """
+    ``SimpleHTTPRequestHandler`` mit einfacher Range-Unterstützung ("bytes=N-").
+    Ohne ``server.range_support`` wird der Range-Header wie beim Original ignoriert.
+    """
+
+    def send_head(self):
+        self.server.requests.append((self.path, self.headers.get("Range")))
+        range_header = self.headers.get("Range")
+        path = self.translate_path(self.path)
+        if not (range_header and self.server.range_support and os.path.isfile(path)):
+            return super().send_head()
+
+        start = int(range_header.split("=", 1)[1].rstrip("-"))
+        size = os.path.getsize(path)
+        if start >= size:
+            self.send_error(416)
+            return None
+        file = open(path, "rb")
+        file.seek(start)
+        self.server.partial_responses += 1
+        self.send_response(206)
+        self.send_header("Content-Length", str(size - start))
+        self.send_header("Content-Range", f"bytes {start}-{size - 1}/{size}")
+        self.end_headers()
+        return file
+
+    def log_message(self, format, *args):
+        pass
+
+
+class UpdateTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.source_dir = os.path.join(self.temp_dir, "source")
+        self.target_dir = os.path.join(self.temp_dir, "target")
+        os.makedirs(os.path.join(self.source_dir, "img", "chars"))
+        os.makedirs(self.target_dir)
+        self.write_source("data.json", b'{"Karte": {}}')
+        self.write_source("img/chars/Anakin.jpg", os.urandom(300 * 1024))
+        self.write_source("img/Buffs/Kraftstoß.jpg", os.urandom(1024))
+        self.publish_manifest()
+
+        handler = partial(RangeRequestHandler, directory=self.source_dir)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.requests = []
+        self.server.range_support = True
+        self.server.partial_responses = 0
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}/"
+        self.manifest_url = self.base_url + "manifest.json"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_source(self, path, content):
+        full_path = self.source_path(path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "wb") as file:
+            file.write(content)
+
+    def write_target(self, path, content):
+        full_path = os.path.join(self.target_dir, *path.split("/"))
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "wb") as file:
+            file.write(content)
+
+    def publish_manifest(self):
+        manifest = build_manifest(self.source_dir, ["img", "data.json"])
+        with open(os.path.join(self.source_dir, "manifest.json"), "w", encoding="utf-8") as file:
+            json.dump(manifest, file)
+        return manifest
+
+    def source_path(self, path):
+        return os.path.join(self.source_dir, *path.split("/"))
+
+    def read(self, root, path):
+        with open(os.path.join(root, *path.split("/")), "rb") as file:
+            return file.read()
+
+    def downloaded_paths(self):
+        return [path for path, _ in self.server.requests if path != "/manifest.json"]
+
+    def test_stage_then_apply(self):
+        updater = AssetUpdater(self.target_dir)
+        self.assertEqual(updater.stage(self.manifest_url), 3)
+        # Bis zum apply bleibt das Zielverzeichnis unverändert
+        self.assertFalse(os.path.exists(os.path.join(self.target_dir, "data.json")))
+
+        self.assertTrue(updater.apply())
+        for path in ["data.json", "img/chars/Anakin.jpg", "img/Buffs/Kraftstoß.jpg"]:
+            self.assertEqual(self.read(self.target_dir, path), self.read(self.source_dir, path))
+        self.assertFalse(os.path.exists(updater.journal_path))
+        self.assertEqual(updater.stage(self.manifest_url), 0)
+
+    def test_only_changed_files_are_downloaded(self):
+        updater = AssetUpdater(self.target_dir)
+        updater.update(self.manifest_url)
+        self.write_source("data.json", b'{"Karte": {"neu": true}}')
+        os.remove(os.path.join(self.source_dir, "img", "Buffs", "Kraftstoß.jpg"))
+        self.publish_manifest()
+        self.server.requests.clear()
+
+        self.assertEqual(updater.stage(self.manifest_url), 1)
+        self.assertEqual(self.downloaded_paths(), ["/data.json"])
+        updater.apply()
+        self.assertEqual(self.read(self.target_dir, "data.json"), b'{"Karte": {"neu": true}}')
+        self.assertFalse(os.path.exists(os.path.join(self.target_dir, "img", "Buffs", "Kraftstoß.jpg")))
+
+    def test_resume_with_range(self):
+        content = self.read(self.source_dir, "img/chars/Anakin.jpg")
+        destination = os.path.join(self.target_dir, "Anakin.jpg")
+        with open(destination + ".part", "wb") as file:
+            file.write(content[:100000])
+
+        sha256 = file_sha256(self.source_path("img/chars/Anakin.jpg"))
+        download_file(self.base_url + "img/chars/Anakin.jpg", destination, sha256, len(content))
+        self.assertEqual(self.server.requests[-1], ("/img/chars/Anakin.jpg", "bytes=100000-"))
+        self.assertEqual(self.server.partial_responses, 1)
+        self.assertEqual(self.read(self.target_dir, "Anakin.jpg"), content)
+        self.assertFalse(os.path.exists(destination + ".part"))
+
+    def test_restart_without_range_support(self):
+        self.server.range_support = False
+        content = self.read(self.source_dir, "img/chars/Anakin.jpg")
+        destination = os.path.join(self.target_dir, "Anakin.jpg")
+        with open(destination + ".part", "wb") as file:
+            file.write(b"x" * 1000)
+
+        sha256 = file_sha256(self.source_path("img/chars/Anakin.jpg"))
+        download_file(self.base_url + "img/chars/Anakin.jpg", destination, sha256, len(content))
+        self.assertEqual(self.server.partial_responses, 0)
+        self.assertEqual(self.read(self.target_dir, "Anakin.jpg"), content)
+
+    def test_complete_part_file_gets_416(self):
+        content = self.read(self.source_dir, "data.json")
+        destination = os.path.join(self.target_dir, "data.json")
+        with open(destination + ".part", "wb") as file:
+            file.write(content)
+
+        download_file(self.base_url + "data.json", destination, file_sha256(self.source_path("data.json")))
+        self.assertEqual(self.server.requests[-1], ("/data.json", f"bytes={len(content)}-"))
+        self.assertEqual(self.read(self.target_dir, "data.json"), content)
+
+    def test_checksum_mismatch(self):
+        destination = os.path.join(self.target_dir, "data.json")
+        with self.assertRaises(ValueError):
+            download_file(self.base_url + "data.json", destination, "0" * 64)
+        self.assertFalse(os.path.exists(destination))
+        self.assertFalse(os.path.exists(destination + ".part"))
+
+    def test_interrupted_apply_is_continued(self):
+        updater = AssetUpdater(self.target_dir)
+        updater.stage(self.manifest_url)
+        # Ein Teil der Dateien ist schon verschoben, als der Prozess endet
+        staged_path = os.path.join(updater.staging_dir, "data.json")
+        os.replace(staged_path, os.path.join(self.target_dir, "data.json"))
+
+        self.assertTrue(AssetUpdater(self.target_dir).apply())
+        self.assertEqual(
+            self.read(self.target_dir, "img/chars/Anakin.jpg"), self.read(self.source_dir, "img/chars/Anakin.jpg")
+        )
+        self.assertEqual(AssetUpdater(self.target_dir).stage(self.manifest_url), 0)
+
+    def test_missing_manifest_means_nothing_to_update(self):
+        os.remove(os.path.join(self.source_dir, "manifest.json"))
+        self.assertEqual(AssetUpdater(self.target_dir).stage(self.manifest_url), 0)
+
+    def test_new_archive_updates_extracted_images(self):
+        with zipfile.ZipFile(self.source_path("img.zip"), "w") as archive:
+            archive.writestr("img/chars/Anakin.jpg", b"neu")
+        with open(os.path.join(self.source_dir, "manifest.json"), "w", encoding="utf-8") as file:
+            json.dump(build_manifest(self.source_dir, ["img.zip"]), file)
+        self.write_target("img/chars/Anakin.jpg", b"alt")
+        self.write_target("img/chars/Entfernt.jpg", b"alt")
+
+        updater = AssetUpdater(self.target_dir)
+        self.assertEqual(updater.stage(self.manifest_url), 1)
+        self.assertTrue(updater.apply())
+        self.assertEqual(self.read(self.target_dir, "img/chars/Anakin.jpg"), b"neu")
+        self.assertFalse(os.path.exists(os.path.join(self.target_dir, "img", "chars", "Entfernt.jpg")))
+
+    def test_archive_is_not_extracted_without_image_directory(self):
+        with zipfile.ZipFile(self.source_path("img.zip"), "w") as archive:
+            archive.writestr("img/chars/Anakin.jpg", b"neu")
+        with open(os.path.join(self.source_dir, "manifest.json"), "w", encoding="utf-8") as file:
+            json.dump(build_manifest(self.source_dir, ["img.zip"]), file)
+
+        AssetUpdater(self.target_dir).update(self.manifest_url)
+        self.assertTrue(os.path.exists(os.path.join(self.target_dir, "img.zip")))
+        self.assertFalse(os.path.exists(os.path.join(self.target_dir, "img")))
+
+
+class PublishedManifestTestCase(unittest.TestCase):
+
+    def test_manifest_matches_repository_files(self):
+        with open(os.path.join(REPO_DIR, "manifest.json"), encoding="utf-8") as file:
+            published = json.load(file)
+        current = build_manifest(REPO_DIR, list(published["files"]))
+        self.assertEqual(
+            stale_manifest_entries(published, current), [],
+            "manifest.json ist veraltet: python update.py --make-manifest img.zip data.json > manifest.json",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,27 +1,385 @@
 import os
-import urllib.request
-import zipfile
+import sys
+import json
+import shutil
+import hashlib
+import argparse
+
+# Quellen der Bilder und Kartendaten
+IMG_ZIP_URL = "https://github.com/blobb999/TitanWar-Combo-Helper/raw/main/img.zip"
+MANIFEST_URL = "https://github.com/blobb999/TitanWar-Combo-Helper/raw/main/manifest.json"
+
+# Arbeitsverzeichnis des Updaters innerhalb des Zielverzeichnisses
+UPDATE_DIR = ".update"
+
+# Archive im Manifest, deren Inhalt lokal auch entpackt vorliegen kann: Archiv -> Verzeichnis
+EXTRACTED_ARCHIVES = {"img.zip": "img"}
+
+# Größe der Blöcke beim Herunterladen und Hashen in Bytes
+CHUNK_SIZE = 64 * 1024
+
+# Timeout für Netzwerkzugriffe in Sekunden
+NETWORK_TIMEOUT = 30
+
+
+def file_sha256(path):
+    """
+    SHA-256 einer Datei, blockweise gelesen.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def write_json_atomic(path, content):
+    """
+    Schreibt JSON über eine temporäre Datei, damit nie eine halbe Datei zurückbleibt.
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        json.dump(content, file, indent=1, ensure_ascii=False)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+
+def read_json(path, default=None):
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return default
+
+
+def download_file(url, destination, sha256=None, size=None):
+    """
+    Lädt eine Datei blockweise herunter und setzt abgebrochene Downloads fort.
+
+    Die Daten landen zunächst in ``destination + ".part"``. Ist diese Datei
+    schon vorhanden, wird per HTTP-Range nur der Rest angefordert; antwortet
+    der Server ohne Range-Unterstützung mit 200, beginnt der Download neu.
+    Erst nach erfolgreicher Prüfung von Größe und Prüfsumme wird die Datei
+    nach ``destination`` verschoben.
+
+    Args:
+        url (str): Quelle.
+        destination (str): Zielpfad.
+        sha256 (str): Erwartete Prüfsumme oder None.
+        size (int): Erwartete Größe in Bytes oder None.
+
+    Raises:
+        ValueError: Wenn Größe oder Prüfsumme nicht stimmen.
+        OSError: Bei Netzwerk- oder Dateifehlern.
+    """
+    # Erst hier importiert, da das Update nur selten läuft
+    import urllib.request
+    import urllib.error
+
+    part_path = destination + ".part"
+    offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    if size is not None and offset > size:
+        offset = 0
+
+    request = urllib.request.Request(url)
+    if offset:
+        request.add_header("Range", f"bytes={offset}-")
+    try:
+        response = urllib.request.urlopen(request, timeout=NETWORK_TIMEOUT)
+    except urllib.error.HTTPError as e:
+        if e.code != 416:
+            raise
+        # Bereich nicht erfüllbar: die Teildatei ist bereits vollständig (oder unbrauchbar)
+        response = None
+
+    if response is not None:
+        with response:
+            if offset and response.status != 206:
+                offset = 0
+            with open(part_path, "ab" if offset else "wb") as file:
+                for chunk in iter(lambda: response.read(CHUNK_SIZE), b""):
+                    file.write(chunk)
+                file.flush()
+                os.fsync(file.fileno())
+
+    actual_size = os.path.getsize(part_path)
+    if size is not None and actual_size != size:
+        os.remove(part_path)
+        raise ValueError(f"{url}: {actual_size} statt {size} Bytes")
+    if sha256 is not None and file_sha256(part_path) != sha256:
+        os.remove(part_path)
+        raise ValueError(f"{url}: Prüfsumme stimmt nicht")
+    os.replace(part_path, destination)
+
+
+def fetch_manifest(url):
+    """
+    Lädt das Manifest: {"files": {"relativer/pfad": {"sha256": ..., "size": ..., "url": optional}}}.
+
+    Returns:
+        dict | None: Das Manifest oder None, wenn keines veröffentlicht ist (HTTP 404).
+    """
+    import urllib.request
+    import urllib.error
+
+    try:
+        with urllib.request.urlopen(url, timeout=NETWORK_TIMEOUT) as response:
+            manifest = json.loads(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        if e.code == 404:
+            return None
+        raise
+    for path in manifest["files"]:
+        parts = path.split("/")
+        if path.startswith("/") or ".." in parts or UPDATE_DIR in parts or ":" in path:
+            raise ValueError(f"Ungültiger Pfad im Manifest: {path}")
+    return manifest
+
+
+def build_manifest(root_dir, paths):
+    """
+    Erzeugt ein Manifest für die angegebenen Dateien und Verzeichnisse unterhalb von ``root_dir``.
+    """
+    files = {}
+    for path in paths:
+        full_path = os.path.join(root_dir, path)
+        if os.path.isdir(full_path):
+            candidates = [
+                os.path.join(directory, name)
+                for directory, _, names in os.walk(full_path) for name in names
+            ]
+        else:
+            candidates = [full_path]
+        for candidate in sorted(candidates):
+            relative_path = os.path.relpath(candidate, root_dir).replace(os.sep, "/")
+            if relative_path.split("/")[0] in (UPDATE_DIR, ".thumbs") or "/.thumbs/" in relative_path:
+                continue
+            files[relative_path] = {"sha256": file_sha256(candidate), "size": os.path.getsize(candidate)}
+    return {"version": 1, "files": files}
+
+
+def stale_manifest_entries(published, current):
+    """
+    Pfade, in denen sich ein veröffentlichtes Manifest von ``build_manifest`` unterscheidet.
+
+    Returns:
+        list: Sortierte Pfade, die fehlen, überzählig sind oder andere Prüfsummen/Größen haben.
+    """
+    published_files = published.get("files", {})
+    current_files = current["files"]
+    return sorted(
+        path for path in set(published_files) | set(current_files)
+        if published_files.get(path) != current_files.get(path)
+    )
+
+
+class AssetUpdater:
+    """
+    Manifestbasiertes Update der Bilder und Kartendaten.
+
+    Ein Update läuft in zwei Schritten. ``stage`` vergleicht das Manifest mit
+    den installierten Dateien, lädt nur geänderte Dateien (fortsetzbar und
+    geprüft) in ein Staging-Verzeichnis und legt danach ein Journal an.
+    ``apply`` verschiebt die Dateien aus dem Staging an ihren Platz und löscht
+    das Journal zuletzt; wird es unterbrochen, setzt der nächste Aufruf an der
+    gleichen Stelle fort. Bis zum ``apply`` bleiben die installierten Dateien
+    unverändert.
+    """
+
+    def __init__(self, target_dir="./"):
+        """
+        Args:
+            target_dir (str): Verzeichnis mit ``img/`` und ``data.json``.
+        """
+        self.target_dir = target_dir
+        self.update_dir = os.path.join(target_dir, UPDATE_DIR)
+        self.staging_dir = os.path.join(self.update_dir, "staging")
+        self.downloads_dir = os.path.join(self.update_dir, "downloads")
+        self.journal_path = os.path.join(self.update_dir, "pending.json")
+        self.installed_path = os.path.join(self.update_dir, "installed.json")
+
+    def local_path(self, path):
+        return os.path.join(self.target_dir, *path.split("/"))
+
+    def changed_files(self, manifest):
+        """
+        Dateien des Manifests, die lokal fehlen oder einen anderen Inhalt haben.
+
+        Unveränderte Dateien werden anhand von Größe und Änderungszeit aus
+        ``installed.json`` erkannt und nur bei Abweichung neu gehasht.
+        """
+        installed = read_json(self.installed_path, {})
+        changed = {}
+        for path, entry in manifest["files"].items():
+            local_path = self.local_path(path)
+            try:
+                stat = os.stat(local_path)
+            except OSError:
+                changed[path] = entry
+                continue
+            record = installed.get(path)
+            if record and record["size"] == stat.st_size and record["mtime_ns"] == stat.st_mtime_ns:
+                sha256 = record["sha256"]
+            else:
+                sha256 = file_sha256(local_path)
+                installed[path] = {"sha256": sha256, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            if sha256 != entry["sha256"]:
+                changed[path] = entry
+        os.makedirs(self.update_dir, exist_ok=True)
+        write_json_atomic(self.installed_path, installed)
+        return changed
+
+    def stage(self, manifest_url, exclude=()):
+        """
+        Lädt geänderte Dateien ins Staging und schreibt das Journal.
+
+        Args:
+            manifest_url (str): URL des Manifests.
+            exclude (tuple): Pfadanfänge, die übersprungen werden, z. B. ("img/",),
+                wenn die Bilder direkt aus img.zip gelesen werden.
+
+        Returns:
+            int: Anzahl der bereitgestellten Dateien (0 = alles aktuell).
+        """
+        if os.path.exists(self.journal_path):
+            # Ein fertig vorbereitetes Update wartet noch auf apply
+            return len(read_json(self.journal_path, {}).get("files", {}))
+
+        manifest = fetch_manifest(manifest_url)
+        if manifest is None:
+            # Ohne veröffentlichtes Manifest gibt es nichts zu aktualisieren
+            return 0
+        manifest["files"] = {
+            path: entry for path, entry in manifest["files"].items() if not path.startswith(tuple(exclude))
+        }
+        changed = self.changed_files(manifest)
+        installed = read_json(self.installed_path, {})
+        removed = [
+            path for path in installed if path not in manifest["files"] and not path.startswith(tuple(exclude))
+        ]
+        if not changed and not removed:
+            return 0
+
+        # Angefangene Downloads gehören zum Inhalt (Prüfsumme), nicht zur Manifest-Version
+        os.makedirs(self.downloads_dir, exist_ok=True)
+        from urllib.parse import urljoin, quote
+        for index, (path, entry) in enumerate(sorted(changed.items()), start=1):
+            staged_path = os.path.join(self.staging_dir, *path.split("/"))
+            if os.path.exists(staged_path) and file_sha256(staged_path) == entry["sha256"]:
+                continue
+            url = urljoin(manifest_url, entry.get("url") or quote(path))
+            download_path = os.path.join(self.downloads_dir, entry["sha256"])
+            print(f"Lade {path} ({index}/{len(changed)})...")
+            download_file(url, download_path, entry["sha256"], entry.get("size"))
+            os.makedirs(os.path.dirname(staged_path), exist_ok=True)
+            os.replace(download_path, staged_path)
+
+        write_json_atomic(self.journal_path, {"files": changed, "removed": removed})
+        return len(changed)
+
+    def apply(self):
+        """
+        Übernimmt ein vorbereitetes Update; ohne Journal passiert nichts.
+
+        Returns:
+            bool: True, wenn ein Update übernommen wurde.
+        """
+        journal = read_json(self.journal_path)
+        if journal is None:
+            return False
+
+        installed = read_json(self.installed_path, {})
+        for path, entry in journal["files"].items():
+            staged_path = os.path.join(self.staging_dir, *path.split("/"))
+            local_path = self.local_path(path)
+            if os.path.exists(staged_path):
+                os.makedirs(os.path.dirname(local_path) or ".", exist_ok=True)
+                os.replace(staged_path, local_path)
+            if os.path.exists(local_path):
+                stat = os.stat(local_path)
+                installed[path] = {"sha256": entry["sha256"], "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            # Entpackte Bilder aus dem neuen Archiv erneuern, sonst blieben sie auf altem Stand
+            directory = EXTRACTED_ARCHIVES.get(path)
+            if directory and os.path.isdir(self.local_path(directory)) and os.path.exists(local_path):
+                extract_zip(local_path, self.target_dir, os.path.join(self.update_dir, "extract"))
+        for path in journal["removed"]:
+            try:
+                os.remove(self.local_path(path))
+            except OSError:
+                pass
+            installed.pop(path, None)
+
+        write_json_atomic(self.installed_path, installed)
+        os.remove(self.journal_path)
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+        print(f"Update übernommen: {len(journal['files'])} Dateien aktualisiert, {len(journal['removed'])} entfernt.")
+        return True
+
+    def update(self, manifest_url, exclude=()):
+        """
+        Bereitet ein Update vor und übernimmt es sofort.
+        """
+        self.stage(manifest_url, exclude)
+        return self.apply()
+
+
+def extract_zip(zip_path, output_dir, staging_dir):
+    """
+    Entpackt ein Archiv über ein Staging-Verzeichnis nach ``output_dir``.
+
+    Erst nach dem vollständigen Entpacken werden die Einträge der obersten
+    Ebene (z. B. ``img/``) gegen die vorhandenen ausgetauscht.
+    """
+    # Erst hier importiert, da das Update nur selten läuft
+    import zipfile
+
+    shutil.rmtree(staging_dir, ignore_errors=True)
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        zip_ref.extractall(staging_dir)
+
+    # Einträge der obersten Ebene austauschen; alte Verzeichnisse erst danach löschen
+    for name in os.listdir(staging_dir):
+        staged_path = os.path.join(staging_dir, name)
+        target_path = os.path.join(output_dir, name)
+        backup_path = os.path.join(os.path.dirname(staging_dir), f"old-{name}")
+        if os.path.isdir(target_path) and not os.path.islink(target_path):
+            shutil.rmtree(backup_path, ignore_errors=True)
+            os.replace(target_path, backup_path)
+            os.replace(staged_path, target_path)
+            shutil.rmtree(backup_path, ignore_errors=True)
+        else:
+            os.replace(staged_path, target_path)
+    shutil.rmtree(staging_dir, ignore_errors=True)
+
 
 def download_and_extract_zip(url, output_dir):
     """
     Lädt eine ZIP-Datei von der angegebenen URL herunter und entpackt sie.
-    
+
+    Der Download wird fortgesetzt, falls er zuvor abgebrochen ist. Entpackt wird
+    in ein Staging-Verzeichnis; erst danach werden die Einträge der obersten
+    Ebene (z. B. ``img/``) gegen die vorhandenen ausgetauscht.
+
     Args:
         url (str): URL der ZIP-Datei.
         output_dir (str): Zielverzeichnis für die entpackten Dateien.
     """
-    zip_path = "img.zip"
+    update_dir = os.path.join(output_dir, UPDATE_DIR)
+    zip_path = os.path.join(update_dir, "img.zip")
+    staging_dir = os.path.join(update_dir, "extract")
 
     try:
+        os.makedirs(update_dir, exist_ok=True)
+
         # Lade die ZIP-Datei herunter
         print(f"Lade {url} herunter...")
-        urllib.request.urlretrieve(url, zip_path)
+        download_file(url, zip_path)
         print("Download abgeschlossen.")
 
-        # Entpacke die ZIP-Datei
+        # Entpacke die ZIP-Datei ins Staging
         print(f"Entpacke {zip_path} nach {output_dir}...")
-        with zipfile.ZipFile(zip_path, "r") as zip_ref:
-            zip_ref.extractall(output_dir)
+        extract_zip(zip_path, output_dir, staging_dir)
         print("Entpacken abgeschlossen.")
 
         # Entferne die ZIP-Datei nach dem Entpacken
@@ -31,13 +389,45 @@ def download_and_extract_zip(url, output_dir):
     except Exception as e:
         print(f"Fehler beim Herunterladen oder Entpacken: {e}")
 
-if __name__ == "__main__":
-    img_url = "https://github.com/blobb999/TitanWar-Combo-Helper/raw/main/img.zip"
-    target_dir = "./"
-    
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bilder und Kartendaten aktualisieren.")
+    parser.add_argument("--target", default="./", help="Zielverzeichnis")
+    parser.add_argument("--manifest-url", default=MANIFEST_URL, help="URL des Manifests")
+    parser.add_argument("--stage-only", action="store_true", help="Nur herunterladen, nicht übernehmen")
+    parser.add_argument("--zip", action="store_true", help="Vollständiges img.zip statt Manifest verwenden")
+    parser.add_argument("--make-manifest", nargs="+", metavar="PFAD",
+                        help="Manifest für diese Dateien/Verzeichnisse unterhalb von --target ausgeben")
+    parser.add_argument("--check", metavar="MANIFEST",
+                        help="Mit --make-manifest: nichts ausgeben, sondern prüfen, ob MANIFEST noch aktuell ist")
+    args = parser.parse_args(argv)
+
+    if args.make_manifest:
+        manifest = build_manifest(args.target, args.make_manifest)
+        if args.check:
+            stale = stale_manifest_entries(read_json(args.check, {}), manifest)
+            for path in stale:
+                print(f"{args.check}: {path} ist veraltet", file=sys.stderr)
+            return 1 if stale else 0
+        json.dump(manifest, sys.stdout, indent=1, ensure_ascii=False)
+        print()
+        return 0
+
     # Sicherstellen, dass das Zielverzeichnis existiert
-    if not os.path.exists(target_dir):
-        os.makedirs(target_dir)
-    
-    # Lade und entpacke die ZIP-Datei
-    download_and_extract_zip(img_url, target_dir)
+    os.makedirs(args.target, exist_ok=True)
+
+    if args.zip:
+        # Lade und entpacke die ZIP-Datei
+        download_and_extract_zip(IMG_ZIP_URL, args.target)
+        return 0
+
+    updater = AssetUpdater(args.target)
+    staged = updater.stage(args.manifest_url)
+    print(f"{staged} Dateien bereitgestellt.")
+    if not args.stage_only:
+        updater.apply()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
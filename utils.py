@@ -2,8 +2,20 @@
 
 import os
 import sys
-import json
-from PIL import Image, ImageTk
+import time
+import threading
+from image_cache import image_cache, thumbnail_cache
+from data_model import CANONICAL_LANGUAGE, get_data_model, load_data_model
+
+# Wartezeit nach der letzten Änderung, bevor die Konfiguration geschrieben wird (Sekunden)
+CONFIG_SAVE_DELAY = 0.5
+
+
+def get_translation_table(data):
+    """
+    Gibt die Übersetzungstabelle für ``data`` aus dem kompilierten Datenmodell zurück.
+    """
+    return get_data_model(data).translations
 
 
 def get_localized_image_name(name, language, data):
@@ -18,11 +30,8 @@ def get_localized_image_name(name, language, data):
     Returns:
         str: Lokalisierter Name des Charakters.
     """
-    for card in data.values():
-        for char in card["characters"]:
-            if char.get(language) == name:
-                return char.get("DE")  # Fallback auf Deutsch
-    return name  # Standardname, falls keine Übersetzung verfügbar
+    # Fallback auf Deutsch, Standardname falls keine Übersetzung verfügbar
+    return get_translation_table(data).translate(name, language, CANONICAL_LANGUAGE)
 
 def get_resource_path(relative_path):
     """
@@ -40,12 +49,14 @@ def get_resource_path(relative_path):
 def load_data(data_file):
     """
     Lädt Daten aus einer JSON-Datei.
+
+    Das kompilierte Datenmodell (IDs, Bitmasken, Übersetzungen) wird dabei mit
+    geladen; ist seine Cache-Datei aktuell, wird das JSON nicht geparst.
     """
     full_path = get_resource_path(data_file)
     if not os.path.exists(full_path):
         raise FileNotFoundError(f"{full_path} fehlt. Bitte erstellen Sie die Datei mit den erforderlichen Daten.")
-    with open(full_path, "r", encoding="utf-8") as file:
-        return json.load(file)
+    return load_data_model(full_path).data
 
 def load_config(config_file):
     """
@@ -80,89 +91,170 @@ def load_config(config_file):
     
     return language, excluded, teams
 
-def save_config(config_file, language, excluded, teams):
+def format_config(language, excluded, teams):
     """
-    Speichert die Konfigurationsdaten in die Datei.
+    Erzeugt den Inhalt der Konfigurationsdatei.
     """
-    with open(config_file, "w") as file:
-        # Schreibe Spracheinstellung
-        file.write("[Settings]\n")
-        file.write(f"language: {language}\n\n")
+    # Schreibe Spracheinstellung
+    lines = ["[Settings]", f"language: {language}", ""]
 
-        # Schreibe ausgeschlossene Charaktere
-        file.write("[Excluded]\n")
-        for char in sorted(excluded):
-            file.write(f"{char}\n")
+    # Schreibe ausgeschlossene Charaktere
+    lines.append("[Excluded]")
+    lines.extend(sorted(excluded))
 
-        # Schreibe Teams
-        file.write("\n[Teams]\n")
-        for team_name, characters in teams.items():
-            file.write(f"{team_name}: {','.join(characters)}\n")
+    # Schreibe Teams
+    lines.extend(["", "[Teams]"])
+    lines.extend(f"{team_name}: {','.join(characters)}" for team_name, characters in teams.items())
+    return "\n".join(lines) + "\n"
+
+def write_file_atomic(path, content):
+    """
+    Schreibt ``content`` zuerst in eine temporäre Datei und ersetzt dann ``path``.
+    Bei einem Absturz bleibt so entweder die alte oder die neue Datei vollständig erhalten.
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w") as file:
+        file.write(content)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+def save_config(config_file, language, excluded, teams):
+    """
+    Speichert die Konfigurationsdaten in die Datei.
+    """
+    write_file_atomic(config_file, format_config(language, excluded, teams))
 
 def load_image(image_path, size, language=None, data=None, char_name=None):
     """
     Lädt ein Bild basierend auf der Sprachpräferenz. Fallback auf Deutsch bei fehlenden Dateien.
+
+    Bereits erzeugte Bilder kommen aus dem gemeinsamen ``image_cache``; wiederholte
+    Aufrufe mit demselben Pfad und derselben Größe lesen nicht erneut von der Platte.
     """
     # Wenn char_name nicht angegeben ist, laden Sie das Bild wie gewohnt
     if char_name is None or data is None or language is None:
-        try:
-            img = Image.open(image_path).resize(size)
-            return ImageTk.PhotoImage(img)
-        except Exception as e:
-            print(f"Fehler beim Laden des Bildes {image_path}: {e}")
-            raise
+        return _load_cached_image(image_path, size)
 
     # Übersetzte Namen und lokalisierte Pfade nur verwenden, wenn char_name angegeben ist
     localized_name = get_localized_image_name(char_name, language, data)
     localized_path = os.path.join("./img/chars", f"{localized_name}.jpg")
     
-    if not os.path.exists(localized_path):
+    if not image_cache.exists(localized_path):
         print(f"Bilddatei {localized_path} nicht gefunden. Platzhalter wird verwendet.")
         localized_path = "./img/placeholder.jpg"  # Fallback
+    return _load_cached_image(localized_path, size)
+
+def _load_cached_image(image_path, size):
+    key = image_cache.make_key(image_path, size)
+    photo = image_cache.get(key)
+    if photo is not None:
+        return photo
+    from PIL import ImageTk  # erst beim ersten Bild laden, hält den Programmstart kurz
     try:
-        img = Image.open(localized_path).resize(size)
-        return ImageTk.PhotoImage(img)
+        img = thumbnail_cache.load(image_path, size)
+        return image_cache.put(key, ImageTk.PhotoImage(img))
     except Exception as e:
-        print(f"Fehler beim Laden des Bildes {localized_path}: {e}")
+        print(f"Fehler beim Laden des Bildes {image_path}: {e}")
         raise
 
-def save_team(config_file, team_name, characters):
+class ConfigStore:
     """
-    Speichert ein Team in der Konfigurationsdatei.
+    Konfiguration im Speicher mit verzögertem, atomarem Schreiben.
+
+    Änderungen werden nur vorgemerkt; ein Hintergrund-Thread schreibt die
+    Datei, sobald ``delay`` Sekunden lang keine weitere Änderung kam. Mehrere
+    schnelle Änderungen ergeben so einen einzigen Schreibvorgang. ``flush``
+    schreibt ausstehende Änderungen sofort (z. B. beim Schließen des Fensters).
     """
-    if not os.path.exists(config_file):
-        open(config_file, "w").close()
 
-    with open(config_file, "r+") as file:
-        lines = file.readlines()
-        file.seek(0)
-        found_team = False
+    def __init__(self, config_file, delay=CONFIG_SAVE_DELAY):
+        """
+        Args:
+            config_file (str): Pfad der Konfigurationsdatei.
+            delay (float): Wartezeit nach der letzten Änderung in Sekunden.
+        """
+        self.config_file = config_file
+        self.delay = delay
+        self.language, self.excluded, self.teams = load_config(config_file)
 
-        # Überschreibe das gewählte Team
-        for line in lines:
-            if line.startswith(f"{team_name}:"):
-                file.write(f"{team_name}: {','.join(characters)}\n")
-                found_team = True
-            else:
-                file.write(line)
+        self.condition = threading.Condition()
+        # Reihenfolge der Locks: erst write_lock, dann condition
+        self.write_lock = threading.Lock()
+        self.dirty = False
+        self.due = 0.0
+        self.closed = False
+        self.writer = threading.Thread(target=self._run, daemon=True)
+        self.writer.start()
 
-        # Falls das Team nicht existiert, füge es hinzu
-        if not found_team:
-            file.write(f"{team_name}: {','.join(characters)}\n")
-        file.truncate()
+    def update(self, language, excluded, teams=None):
+        """
+        Übernimmt den aktuellen Stand (als Kopie) und merkt das Schreiben vor.
+        Ohne ``teams`` bleiben die gespeicherten Teams unverändert.
+        """
+        with self.condition:
+            self.language = language
+            self.excluded = set(excluded)
+            if teams is not None:
+                self.teams = {team_name: list(characters) for team_name, characters in teams.items()}
+            self._schedule()
 
-def load_team(config_file, team_name):
-    """
-    Lädt ein Team aus der Konfigurationsdatei.
-    """
-    if not os.path.exists(config_file):
-        return []
+    def save_team(self, team_name, characters):
+        """
+        Speichert ein Team unter seinem Namen und merkt das Schreiben vor.
+        """
+        with self.condition:
+            self.teams[team_name] = list(characters)
+            self._schedule()
+
+    def load_team(self, team_name):
+        """
+        Mitglieder eines gespeicherten Teams; unbekannte Teams sind leer.
+        """
+        with self.condition:
+            return list(self.teams.get(team_name, []))
+
+    def _schedule(self):
+        self.dirty = True
+        self.due = time.monotonic() + self.delay
+        self.condition.notify()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.closed and (not self.dirty or time.monotonic() < self.due):
+                    self.condition.wait(max(0.0, self.due - time.monotonic()) if self.dirty else None)
+                if self.closed:
+                    return
+            self._write()
+
+    def _write(self):
+        with self.write_lock:
+            with self.condition:
+                if not self.dirty:
+                    return
+                content = format_config(self.language, self.excluded, self.teams)
+                self.dirty = False
+            try:
+                write_file_atomic(self.config_file, content)
+            except OSError as e:
+                print(f"Konfiguration konnte nicht gespeichert werden: {e}")
+
+    def flush(self):
+        """
+        Schreibt ausstehende Änderungen sofort.
+        """
+        self._write()
+
+    def close(self):
+        """
+        Schreibt ausstehende Änderungen und beendet den Hintergrund-Thread.
+        """
+        self.flush()
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
 
-    with open(config_file, "r") as file:
-        for line in file:
-            if line.startswith(f"{team_name}:"):
-                return [char.strip() for char in line.strip().split(":")[1].split(",") if char.strip()]
-    return []
 
 
 